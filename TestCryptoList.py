@@ -1,5 +1,4 @@
 import streamlit as st
-import numpy as np
 import pandas as pd
 import requests
 import plotly.graph_objects as go
@@ -10,7 +9,6 @@ import streamlit.components.v1 as components
 from collections import Counter
 from wordcloud import WordCloud
 import matplotlib.pyplot as plt
-import re
 import urllib.request
 import urllib.parse
 from bs4 import BeautifulSoup
@@ -19,6 +17,25 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup  # BeautifulSoup 모듈 정의 추가
 from googlesearch import search  # Google 검색을 위한 추가
+from concurrent.futures import ThreadPoolExecutor
+from analytics import (compute_dominance, load_circulating_supply, build_close_matrix,
+                       compute_returns, rolling_volatility, RollingCorrelation)
+from shared_cache import cached, cached_entry
+import scheduler
+from endpoints import BITHUMB_API_URL, NEWSAPI_URL, GDELT_API_URL, NAVER_API_URL, upstream_name
+from metrics import span
+import metrics
+from thumbnails import thumbnail_urls
+from charting import build_price_figure, get_cached_figure
+from market_data import candles_to_frame, build_price_table, add_technical_indicators
+from news import dedupe_articles, get_top_keywords
+import os
+
+# 공유 캐시 유지 시간 (초)
+TICKER_TTL = 5
+CANDLE_TTL = 60
+NEWS_TTL = 600
+GLOSSARY_TTL = 86400
 
 ########################### 비트알고 프로젝트 소개 ##############################
 
@@ -37,7 +54,8 @@ def show_project_intro():
         # 웹에서 한글 폰트 다운로드
         font_url = "https://github.com/google/fonts/raw/main/ofl/nanumgothic/NanumGothic-Regular.ttf"
         font_path = "./NanumGothic-Regular.ttf"
-        urllib.request.urlretrieve(font_url, font_path)
+        if not os.path.exists(font_path):
+            urllib.request.urlretrieve(font_url, font_path)
 
         # 키워드 추출 및 워드클라우드 생성
         keywords = '비트알고 실시간 가상자산 시세 기술적 분석 이동평균 MACD 볼린저밴드 CCI 투자 암호화폐 거래소 트레이딩 스토캐스틱 RSI 알트코인 비트코인 이더리움 리플 기술적지표 추세분석 거래량 패턴분석 포트폴리오 관리 위험관리 차트분석 cryptocurrency blockchain real-time trading moving average Bollinger Bands MACD CCI investment crypto exchange stochastic RSI altcoin Bitcoin Ethereum Ripple technical analysis trend analysis volume analysis pattern analysis portfolio management risk management chart analysis market data visualization'
@@ -59,18 +77,32 @@ def show_project_intro():
         st.error(f"오류가 발생했습니다: {e}")
         
 ########################### 실시간 가상자산 시세 ##############################
+# JSON 응답을 가져오는 함수 (HTTP 오류 시 예외 발생)
+def fetch_json(url, headers=None, params=None, priority=scheduler.INTERACTIVE):
+    response = scheduler.request(url, headers=headers, params=params, priority=priority)
+    response.raise_for_status()
+    with span('parse', upstream_name(url)):
+        return response.json()
+
+# 빗썸 API 응답을 확인하여 data 필드 반환 (실패 시 예외 발생 - 실패한 응답은 캐시하지 않음)
+def fetch_bithumb_data(url, priority=scheduler.INTERACTIVE):
+    response = scheduler.request(url, priority=priority)
+    response.raise_for_status()
+    with span('parse', 'bithumb'):
+        data = response.json()
+    if data['status'] != '0000':
+        raise requests.exceptions.HTTPError(f"Bithumb API status {data['status']}")
+    return data['data']
+
 # 가상자산 정보 가져오기 함수
 def get_all_crypto_info():
-    url = "https://api.bithumb.com/public/ticker/ALL_KRW"
-    response = requests.get(url, timeout=10)
-    if response.status_code == 200:
-        try:
-            data = response.json()
-            if data['status'] == '0000':
-                return data['data']
-        except ValueError:
-            st.error("데이터를 파싱하는 데 실패했습니다.")
-    else:
+    url = f"{BITHUMB_API_URL}/public/ticker/ALL_KRW"
+    try:
+        with span('fetch', 'bithumb_ticker_all'):
+            return cached('bithumb:ticker:ALL_KRW', TICKER_TTL, lambda: fetch_bithumb_data(url))
+    except ValueError:
+        st.error("데이터를 파싱하는 데 실패했습니다.")
+    except requests.exceptions.RequestException:
         st.error("데이터를 가져오지 못했습니다.")
     return {}
 
@@ -83,6 +115,20 @@ def load_korean_names():
         st.error(f"코인 이름 CSV 파일을 로드하는 데 실패했습니다: {e}")
         return {}
 
+# 코인별 캔들스틱 캐시 항목 가져오기 함수 (값과 함께 버전을 돌려주어 차트 캐시 키로 사용)
+def get_candlestick_entry(coin_symbol, interval='24h', priority=scheduler.INTERACTIVE):
+    url = f"{BITHUMB_API_URL}/public/candlestick/{coin_symbol}_KRW/{interval}"
+    try:
+        with span('fetch', 'bithumb_candlestick'):
+            return cached_entry(f'bithumb:candlestick:{coin_symbol}:{interval}', CANDLE_TTL, lambda: fetch_bithumb_data(url, priority))
+    except (requests.exceptions.RequestException, ValueError):
+        return None
+
+# 코인별 캔들스틱 데이터 가져오기 함수
+def get_candlestick_data(coin_symbol, interval='24h', priority=scheduler.INTERACTIVE):
+    entry = get_candlestick_entry(coin_symbol, interval, priority)
+    return entry.value if entry else []
+
 # 실시간 가상자산 시세 확인 페이지
 def show_live_prices():
     st.write("**실시간 가상자산 시세**")
@@ -96,23 +142,10 @@ def show_live_prices():
         return
     
     # 데이터프레임 생성 및 표시
-    prices_data = {
-        '코인': [],
-        '코인 이름': [],
-        '현재가 (KRW)': [],
-        '전일 대비 (%)': []
-    }
-    
-    for key, value in crypto_info.items():
-        if key == 'date':
-            continue
-        prices_data['코인'].append(key)
-        prices_data['코인 이름'].append(korean_names.get(key, key))
-        prices_data['현재가 (KRW)'].append(value['closing_price'])
-        prices_data['전일 대비 (%)'].append(value['fluctate_rate_24H'])
-    
-    df_prices = pd.DataFrame(prices_data)
-    st.dataframe(df_prices)
+    with span('compute', 'price_table'):
+        df_prices = build_price_table(crypto_info, korean_names)
+    with span('render', 'price_table'):
+        st.dataframe(df_prices)
     
     # 특정 코인의 시세를 그래프로 표현
     selected_coin = st.selectbox("시세를 보고 싶은 코인을 선택하세요", df_prices['코인 이름'])
@@ -120,219 +153,191 @@ def show_live_prices():
     if coin_data:
         st.write(f"**{selected_coin} 시세 그래프**")
         coin_symbol = df_prices[df_prices['코인 이름'] == selected_coin]['코인'].values[0]
-        historical_url = f"https://api.bithumb.com/public/candlestick/{coin_symbol}_KRW/24h"
-        historical_response = requests.get(historical_url)
-        if historical_response.status_code == 200:
-            historical_data = historical_response.json()
-            if historical_data['status'] == '0000':
-                historical_prices = [float(entry[2]) for entry in historical_data['data']]
-                historical_dates = [pd.to_datetime(entry[0], unit='ms').strftime('%Y-%m-%d %H:%M:%S') for entry in historical_data['data']]
-                historical_volumes = [float(entry[5]) for entry in historical_data['data']]
-                
-                historical_df = pd.DataFrame({'시간': historical_dates, '가격 (KRW)': historical_prices, '거래량': historical_volumes})
-                
-                # 이동평균(Moving Average) 계산 및 추가
-                historical_df['이동평균 (5일)'] = historical_df['가격 (KRW)'].rolling(window=5).mean()
-                historical_df['이동평균 (10일)'] = historical_df['가격 (KRW)'].rolling(window=10).mean()
-                
-                # RSI (Relative Strength Index) 계산
-                delta = historical_df['가격 (KRW)'].diff()
-                gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-                loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-                rs = gain / loss
-                historical_df['RSI (14)'] = 100 - (100 / (1 + rs))
-                
-                # MACD (Moving Average Convergence Divergence) 계산
-                short_ema = historical_df['가격 (KRW)'].ewm(span=12, adjust=False).mean()
-                long_ema = historical_df['가격 (KRW)'].ewm(span=26, adjust=False).mean()
-                historical_df['MACD'] = short_ema - long_ema
-                historical_df['Signal Line'] = historical_df['MACD'].ewm(span=9, adjust=False).mean()
-                
-                # 볼린저 밴드 (Bollinger Bands) 계산
-                historical_df['볼린저 중간선'] = historical_df['가격 (KRW)'].rolling(window=20).mean()
-                historical_df['볼린저 상단'] = historical_df['볼린저 중간선'] + (historical_df['가격 (KRW)'].rolling(window=20).std() * 2)
-                historical_df['볼린저 하단'] = historical_df['볼린저 중간선'] - (historical_df['가격 (KRW)'].rolling(window=20).std() * 2)
-                
-                # CCI (Commodity Channel Index) 계산
-                tp = (historical_df['가격 (KRW)'] + historical_df['가격 (KRW)'] + historical_df['가격 (KRW)']) / 3
-                ma = tp.rolling(window=20).mean()
-                md = tp.rolling(window=20).apply(lambda x: np.fabs(x - x.mean()).mean(), raw=True)
-                historical_df['CCI'] = (tp - ma) / (0.015 * md)
-                
-                # 슬라이더 바 기능 추가 (기간 설정)
-                start_date, end_date = st.slider(
-                    "기간을 선택하세요",
-                    min_value=pd.to_datetime(historical_df['시간']).min().to_pydatetime(),
-                    max_value=pd.to_datetime(historical_df['시간']).max().to_pydatetime(),
-                    value=(pd.to_datetime(historical_df['시간']).min().to_pydatetime(), pd.to_datetime(historical_df['시간']).max().to_pydatetime())
-                )
-                
-                # 선택된 기간으로 데이터 필터링
-                mask = (
-                    (pd.to_datetime(historical_df['시간']) >= start_date) &
-                    (pd.to_datetime(historical_df['시간']) <= end_date)
-                )
-                filtered_df = historical_df.loc[mask]
-                
-                # 가격 변동 및 이동평균 차트
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=filtered_df['시간'],
-                    y=filtered_df['가격 (KRW)'],
-                    mode='lines',
-                    name='가격 (KRW)'
-                ))
-                
-                # 선택된 추가 기능에 따라 차트에 추가
-                options = st.multiselect(
-                    "추가할 기술적 지표를 선택하세요", ['이동평균 (5일)', '이동평균 (10일)', 'MACD', '볼린저 밴드', 'CCI']
-                )
-                
-                if '이동평균 (5일)' in options:
-                    fig.add_trace(go.Scatter(
-                        x=filtered_df['시간'],
-                        y=filtered_df['이동평균 (5일)'],
-                        mode='lines',
-                        name='이동평균 (5일)',
-                        line=dict(dash='dot')
-                    ))
-                if '이동평균 (10일)' in options:
-                    fig.add_trace(go.Scatter(
-                        x=filtered_df['시간'],
-                        y=filtered_df['이동평균 (10일)'],
-                        mode='lines',
-                        name='이동평균 (10일)',
-                        line=dict(dash='dash')
-                    ))
-                
-                # MACD 차트를 별도로 표시
-                if 'MACD' in options:
-                    st.write(f"**{selected_coin} MACD 지표**")
-                    fig_macd = go.Figure()
-                    fig_macd.add_trace(go.Scatter(
-                        x=filtered_df['시간'],
-                        y=filtered_df['MACD'],
-                        mode='lines',
-                        name='MACD',
-                        line=dict(color='purple')
-                    ))
-                    fig_macd.add_trace(go.Scatter(
-                        x=filtered_df['시간'],
-                        y=filtered_df['Signal Line'],
-                        mode='lines',
-                        name='Signal Line',
-                        line=dict(color='blue', dash='dot')
-                    ))
-                    fig_macd.update_layout(title=f'{selected_coin} MACD', xaxis_title='시간', yaxis_title='값')
-                    st.plotly_chart(fig_macd)
-                
-                # CCI 차트를 별도로 표시
-                if 'CCI' in options:
-                    st.write(f"**{selected_coin} CCI 지표**")
-                    fig_cci = go.Figure()
-                    fig_cci.add_trace(go.Scatter(
-                        x=filtered_df['시간'],
-                        y=filtered_df['CCI'],
-                        mode='lines',
-                        name='CCI',
-                        line=dict(color='brown')
-                    ))
-                    fig_cci.update_layout(title=f'{selected_coin} CCI', xaxis_title='시간', yaxis_title='값')
-                    st.plotly_chart(fig_cci)
-                
-                # 볼린저 밴드 차트를 추가
-                if '볼린저 밴드' in options:
-                    fig.add_trace(go.Scatter(
-                        x=filtered_df['시간'],
-                        y=filtered_df['볼린저 상단'],
-                        mode='lines',
-                        name='볼린저 상단',
-                        line=dict(color='green', dash='dot')
-                    ))
-                    fig.add_trace(go.Scatter(
-                        x=filtered_df['시간'],
-                        y=filtered_df['볼린저 하단'],
-                        mode='lines',
-                        name='볼린저 하단',
-                        line=dict(color='red', dash='dot')
-                    ))
-                
-                fig.update_layout(title=f'{selected_coin} 가격 및 기술적 지표', xaxis_title='시간', yaxis_title='가격 (KRW)')
-                st.plotly_chart(fig)
-                
-                # RSI 차트 별도 시각화
-                if 'RSI (14)' in options:
-                    st.write(f"**{selected_coin} RSI (14) 지표**")
-                    fig_rsi = go.Figure()
-                    fig_rsi.add_trace(go.Scatter(
-                        x=filtered_df['시간'],
-                        y=filtered_df['RSI (14)'],
-                        mode='lines',
-                        name='RSI (14)',
-                        line=dict(color='orange')
-                    ))
-                    fig_rsi.update_layout(title=f'{selected_coin} RSI (14)', xaxis_title='시간', yaxis_title='RSI')
-                    st.plotly_chart(fig_rsi)
-                
-                # 거래량 차트 추가
-                st.write(f"**{selected_coin} 거래량**")
-                fig_volume = go.Figure()
-                fig_volume.add_trace(go.Bar(
-                    x=filtered_df['시간'],
-                    y=filtered_df['거래량'],
-                    name='거래량',
-                    marker_color='blue'
-                ))
-                fig_volume.update_layout(title=f'{selected_coin} 거래량', xaxis_title='시간', yaxis_title='거래량')
-                st.plotly_chart(fig_volume)
-                
-                # 간단한 설명 추가
-                if '이동평균 (5일)' in options or '이동평균 (10일)' in options:
-                    st.write('''
-                        **이동평균(Moving Average)이란?**
-                        
-                        이동평균은 일정 기간 동안의 평균 가격을 의미하며, 가격 변동의 방향성을 확인하는 데 사용됩니다. 
-                        - **단기 이동평균 (5일)**: 최근 5일 동안의 평균 가격을 나타내며, 단기적인 추세를 파악하는 데 유용합니다.
-                        - **장기 이동평균 (10일)**: 최근 10일 동안의 평균 가격을 나타내며, 보다 긴 추세를 확인하는 데 사용됩니다.
-                    ''')
-                
-                if 'RSI (14)' in options:
-                    st.write('''
-                        **RSI (Relative Strength Index)란?**
-                        
-                        RSI는 자산의 과매수 또는 과매도 상태를 나타내는 기술적 지표입니다. 
-                        - **RSI > 70**: 자산이 과매수 상태에 있으며 가격 조정 가능성이 높음을 의미합니다.
-                        - **RSI < 30**: 자산이 과매도 상태에 있으며 반등 가능성이 있음을 의미합니다.
-                    ''')
-                
-                if 'MACD' in options:
-                    st.write('''
-                        **MACD (Moving Average Convergence Divergence)란?**
-                        
-                        MACD는 단기 이동평균과 장기 이동평균의 차이를 이용해 가격 추세의 강도와 방향을 나타내는 지표입니다. Signal Line과의 교차를 통해 매수/매도 신호를 판단합니다.
-                    ''')
-                
-                if '볼린저 밴드' in options:
-                    st.write('''
-                        **볼린저 밴드 (Bollinger Bands)란?**
-                        
-                        볼린저 밴드는 이동평균선을 중심으로 표준편차를 이용해 가격 변동성을 시각화한 지표입니다. 상단 밴드와 하단 밴드 사이의 간격을 통해 변동성을 확인할 수 있습니다.
-                    ''')
-                
-                if 'CCI' in options:
-                    st.write('''
-                        **CCI (Commodity Channel Index)란?**
-                        
-                        CCI는 자산 가격의 변동성을 측정하여 과매수 및 과매도 상태를 파악하는 데 사용되는 지표입니다. 
-                        - **CCI > 100**: 자산이 과매수 상태에 있으며 조정 가능성이 있음을 의미합니다.
-                        - **CCI < -100**: 자산이 과매도 상태에 있으며 반등 가능성이 있음을 의미합니다.
-                    ''')
-            else:
-                st.error("역사적 데이터를 가져오지 못했습니다.")
+        interval = st.selectbox("캔들 간격을 선택하세요", ['24h', '12h', '6h', '1h', '30m', '10m', '5m', '3m', '1m'])
+        candle_entry = get_candlestick_entry(coin_symbol, interval)
+        historical_data = candle_entry.value if candle_entry else []
+        if historical_data:
+            with span('compute', 'candles_to_frame'):
+                historical_df = candles_to_frame(historical_data)
+            
+            # 슬라이더 바 기능 추가 (기간 설정)
+            start_date, end_date = st.slider(
+                "기간을 선택하세요",
+                min_value=historical_df['시간'].min().to_pydatetime(),
+                max_value=historical_df['시간'].max().to_pydatetime(),
+                value=(historical_df['시간'].min().to_pydatetime(), historical_df['시간'].max().to_pydatetime()),
+                step=pd.Timedelta(interval).to_pytimedelta()
+            )
+            
+            # 선택된 추가 기능에 따라 차트에 추가
+            options = st.multiselect(
+                "추가할 기술적 지표를 선택하세요", ['이동평균 (5일)', '이동평균 (10일)', 'MACD', '볼린저 밴드', 'CCI', 'RSI (14)']
+            )
+            
+            # 가격 / 지표 / 거래량을 하나의 차트로 표시 (같은 조건의 차트는 캐시에서 재사용)
+            def build_figure():
+                # 지표는 전체 기간으로 계산한 뒤 선택된 기간으로 필터링
+                with span('compute', 'indicators'):
+                    indicator_df = add_technical_indicators(historical_df.copy())
+                    mask = (indicator_df['시간'] >= start_date) & (indicator_df['시간'] <= end_date)
+                with span('render', 'build_price_figure'):
+                    return build_price_figure(indicator_df.loc[mask], options, f'{selected_coin} 가격 및 기술적 지표')
+            
+            # 진행 중인 마지막 봉은 같은 시각에 종가가 바뀌므로 캐시 항목 버전과 마지막 봉 전체를 키에 포함
+            figure_key = (
+                coin_symbol, interval, start_date, end_date, tuple(sorted(options)),
+                candle_entry.version, tuple(historical_data[-1]), len(historical_data)
+            )
+            with span('render', 'price_chart'):
+                fig = get_cached_figure(figure_key, build_figure)
+                st.plotly_chart(fig, use_container_width=True)
+            
+            # 간단한 설명 추가
+            if '이동평균 (5일)' in options or '이동평균 (10일)' in options:
+                st.write('''
+                    **이동평균(Moving Average)이란?**
+                    
+                    이동평균은 일정 기간 동안의 평균 가격을 의미하며, 가격 변동의 방향성을 확인하는 데 사용됩니다. 
+                    - **단기 이동평균 (5일)**: 최근 5일 동안의 평균 가격을 나타내며, 단기적인 추세를 파악하는 데 유용합니다.
+                    - **장기 이동평균 (10일)**: 최근 10일 동안의 평균 가격을 나타내며, 보다 긴 추세를 확인하는 데 사용됩니다.
+                ''')
+            
+            if 'RSI (14)' in options:
+                st.write('''
+                    **RSI (Relative Strength Index)란?**
+                    
+                    RSI는 자산의 과매수 또는 과매도 상태를 나타내는 기술적 지표입니다. 
+                    - **RSI > 70**: 자산이 과매수 상태에 있으며 가격 조정 가능성이 높음을 의미합니다.
+                    - **RSI < 30**: 자산이 과매도 상태에 있으며 반등 가능성이 있음을 의미합니다.
+                ''')
+            
+            if 'MACD' in options:
+                st.write('''
+                    **MACD (Moving Average Convergence Divergence)란?**
+                    
+                    MACD는 단기 이동평균과 장기 이동평균의 차이를 이용해 가격 추세의 강도와 방향을 나타내는 지표입니다. Signal Line과의 교차를 통해 매수/매도 신호를 판단합니다.
+                ''')
+            
+            if '볼린저 밴드' in options:
+                st.write('''
+                    **볼린저 밴드 (Bollinger Bands)란?**
+                    
+                    볼린저 밴드는 이동평균선을 중심으로 표준편차를 이용해 가격 변동성을 시각화한 지표입니다. 상단 밴드와 하단 밴드 사이의 간격을 통해 변동성을 확인할 수 있습니다.
+                ''')
+            
+            if 'CCI' in options:
+                st.write('''
+                    **CCI (Commodity Channel Index)란?**
+                    
+                    CCI는 자산 가격의 변동성을 측정하여 과매수 및 과매도 상태를 파악하는 데 사용되는 지표입니다. 
+                    - **CCI > 100**: 자산이 과매수 상태에 있으며 조정 가능성이 있음을 의미합니다.
+                    - **CCI < -100**: 자산이 과매도 상태에 있으며 반등 가능성이 있음을 의미합니다.
+                ''')
         else:
             st.error("역사적 데이터를 가져오지 못했습니다.")
 
 
+########################### 시장 분석 (도미넌스 / 변동성 / 상관관계) ##############################
+
+# 여러 코인의 캔들 데이터를 병렬로 가져와 종가 행렬로 변환 (1분 캐시)
+# 전체 코인 조회는 화면 로딩 요청보다 낮은 우선순위(SWEEP)로 스케줄러에 넣음
+@st.cache_data(ttl=60, show_spinner=False)
+def get_close_matrix(symbols, interval='24h'):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = executor.map(lambda symbol: get_candlestick_data(symbol, interval, scheduler.SWEEP), symbols)
+        candles = dict(zip(symbols, results))
+    return build_close_matrix(candles)
+
+# 시장 분석 페이지
+def show_market_analytics():
+    st.write("**시장 분석 - 도미넌스 / 변동성 / 상관관계**")
+
+    crypto_info = get_all_crypto_info()
+    korean_names = load_korean_names()
+
+    if not crypto_info:
+        st.error("가상자산 데이터를 가져올 수 없습니다.")
+        return
+
+    # 도미넌스 차트
+    circulating_supply = load_circulating_supply()
+    with span('compute', 'dominance'):
+        df_dominance = compute_dominance(crypto_info, circulating_supply)
+        df_dominance.insert(1, '코인 이름', df_dominance['코인'].map(lambda key: korean_names.get(key, key)))
+    dominance_column = '시가총액 도미넌스 (%)' if circulating_supply else '거래대금 도미넌스 (%)'
+
+    st.write(f"**{dominance_column.replace(' (%)', '')}**")
+    top_dominance = df_dominance.head(10)
+    others = pd.DataFrame({'코인 이름': ['기타'], dominance_column: [100 - top_dominance[dominance_column].sum()]})
+    with span('render', 'dominance_chart'):
+        fig_dominance = px.pie(pd.concat([top_dominance, others]), names='코인 이름', values=dominance_column, hole=0.4)
+        st.plotly_chart(fig_dominance)
+        st.dataframe(df_dominance)
+
+    # 분석 조건 설정
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        interval = st.selectbox("캔들 간격", ['24h', '12h', '6h', '1h', '30m', '10m'])
+    with col2:
+        window = st.slider("롤링 기간 (봉 개수)", min_value=10, max_value=120, value=30)
+    with col3:
+        top_n = st.slider("분석할 코인 수 (거래대금 상위)", min_value=5, max_value=len(df_dominance), value=min(50, len(df_dominance)))
+
+    # 순위로 상위 코인을 고른 뒤 이름순으로 정렬 - 시세 갱신으로 순위만 바뀌면 캐시 키와 상관관계 상태를 그대로 사용
+    symbols = tuple(sorted(df_dominance.sort_values('거래대금 도미넌스 (%)', ascending=False)['코인'].head(top_n)))
+    with st.spinner("캔들 데이터를 불러오는 중입니다..."), span('fetch', 'close_matrix'):
+        close = get_close_matrix(symbols, interval)
+
+    if close.empty or len(close) <= window:
+        st.error("상관관계를 계산할 데이터가 부족합니다.")
+        return
+
+    # 롤링 변동성 (최근 값 기준 상위 20개)
+    with span('compute', 'volatility'):
+        returns = compute_returns(close)
+        volatility = rolling_volatility(returns, window=window, interval=interval).iloc[-1].dropna().sort_values(ascending=False)
+    st.write(f"**연율화 변동성 ({window}봉 기준, %)**")
+    with span('render', 'volatility_chart'):
+        fig_volatility = go.Figure(go.Bar(
+            x=[korean_names.get(key, key) for key in volatility.index[:20]],
+            y=volatility.values[:20],
+            marker_color='orange'
+        ))
+        fig_volatility.update_layout(xaxis_title='코인', yaxis_title='변동성 (%)')
+        st.plotly_chart(fig_volatility)
+
+    # 상관관계 행렬 - 같은 조건이면 진행 중이던 봉은 교체하고 새로 들어온 봉만 증분 반영
+    with span('compute', 'correlation'):
+        state_key = (tuple(returns.columns), interval, window)
+        corr_state = st.session_state.get('corr_state')
+        if not (corr_state and corr_state['key'] == state_key and corr_state['engine'].refresh(returns)):
+            corr_state = {'key': state_key, 'engine': RollingCorrelation(returns, window=window)}
+        st.session_state['corr_state'] = corr_state
+        corr = corr_state['engine'].matrix()
+
+    labels = [korean_names.get(key, key) for key in corr.columns]
+    st.write(f"**수익률 상관관계 히트맵 ({window}봉 기준)**")
+    with span('render', 'correlation_heatmap'):
+        fig_corr = go.Figure(go.Heatmap(
+            z=corr.values,
+            x=labels,
+            y=labels,
+            zmin=-1,
+            zmax=1,
+            colorscale='RdBu_r'
+        ))
+        fig_corr.update_layout(height=max(500, 12 * len(labels)), yaxis=dict(autorange='reversed'))
+        st.plotly_chart(fig_corr, use_container_width=True)
+
+    st.write('''
+        **도미넌스와 상관관계란?**
+
+        - **도미넌스**: 전체 시장(거래대금 또는 시가총액)에서 특정 가상자산이 차지하는 비중입니다.
+        - **변동성**: 일정 기간 수익률의 표준편차를 연 단위로 환산한 값으로, 가격이 얼마나 크게 움직이는지를 나타냅니다.
+        - **상관관계**: 두 가상자산의 수익률이 같은 방향으로 움직이는 정도(-1 ~ 1)입니다. 1에 가까울수록 함께 움직입니다.
+    ''')
+
+
 #################################################모의투자##############################################
 def show_investment_performance():
     st.markdown("<h2 style='font-size:30px;'>모의 투자</h2>", unsafe_allow_html=True)
@@ -351,56 +356,48 @@ def show_investment_performance():
 
     # 선택한 코인에 대한 정보 가져오기
     coin_key = list(korean_names.keys())[list(korean_names.values()).index(selected_coin)]
-    url = f"https://api.bithumb.com/public/ticker/{coin_key}_KRW"
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.json()
-        if data['status'] == '0000':
-            current_price = float(data['data']['closing_price'])
-        else:
-            st.error("데이터를 가져오지 못했습니다.")
-            return
-    else:
+    url = f"{BITHUMB_API_URL}/public/ticker/{coin_key}_KRW"
+    try:
+        with span('fetch', 'ticker'):
+            data = cached(f'bithumb:ticker:{coin_key}', TICKER_TTL, lambda: fetch_bithumb_data(url))
+        current_price = float(data['closing_price'])
+    except (requests.exceptions.RequestException, ValueError):
         st.error("데이터를 가져오지 못했습니다.")
         return
 
     # 매주 투자 시뮬레이션
-    historical_url = f"https://api.bithumb.com/public/candlestick/{coin_key}_KRW/24h"
-    historical_response = requests.get(historical_url)
-    if historical_response.status_code == 200:
-        historical_data = historical_response.json()
-        if historical_data['status'] == '0000':
-            price_data = [float(entry[2]) for entry in historical_data['data'][-12:]]  # 최근 12개의 일간 종가 데이터 사용
-        else:
-            st.error("역사적 데이터를 가져오지 못했습니다.")
-            return
+    historical_data = get_candlestick_data(coin_key, '24h')
+    if historical_data:
+        price_data = [float(entry[2]) for entry in historical_data[-12:]]  # 최근 12개의 일간 종가 데이터 사용
     else:
         st.error("역사적 데이터를 가져오지 못했습니다.")
         return
 
-    investment_data = {
-        '날짜': pd.date_range(end=pd.Timestamp.now(), periods=12, freq='W').strftime('%Y-%m-%d'),
-        '가격 (KRW)': price_data
-    }
-    df = pd.DataFrame(investment_data)
-
-    # 투자 로직: 매주 가격에 맞춰 적립식으로 투자
-    df['투자 금액 (KRW)'] = weekly_investment
-    df['매수량'] = df['투자 금액 (KRW)'] / df['가격 (KRW)']
-    df['누적 매수량'] = df['매수량'].cumsum()
-    df['누적 투자 금액 (KRW)'] = weekly_investment * (df.index + 1)
-    df['평균 매수 가격 (KRW)'] = (df['누적 투자 금액 (KRW)'] / df['누적 매수량']).astype(int)
-    df['수익률 (%)'] = ((df['가격 (KRW)'] - df['평균 매수 가격 (KRW)']) / df['평균 매수 가격 (KRW)']) * 100
+    with span('compute', 'simulation'):
+        investment_data = {
+            '날짜': pd.date_range(end=pd.Timestamp.now(), periods=12, freq='W').strftime('%Y-%m-%d'),
+            '가격 (KRW)': price_data
+        }
+        df = pd.DataFrame(investment_data)
+
+        # 투자 로직: 매주 가격에 맞춰 적립식으로 투자
+        df['투자 금액 (KRW)'] = weekly_investment
+        df['매수량'] = df['투자 금액 (KRW)'] / df['가격 (KRW)']
+        df['누적 매수량'] = df['매수량'].cumsum()
+        df['누적 투자 금액 (KRW)'] = weekly_investment * (df.index + 1)
+        df['평균 매수 가격 (KRW)'] = (df['누적 투자 금액 (KRW)'] / df['누적 매수량']).astype(int)
+        df['수익률 (%)'] = ((df['가격 (KRW)'] - df['평균 매수 가격 (KRW)']) / df['평균 매수 가격 (KRW)']) * 100
 
     # 결과 출력
-    st.write(df)
-    st.write(f"총 투자 금액: {df['누적 투자 금액 (KRW)'].iloc[-1]} KRW")
-    st.write(f"총 매수량: {df['누적 매수량'].iloc[-1]:.6f} 코인")
-    st.write(f"최종 수익률: {df['수익률 (%)'].iloc[-1]:.2f}%")
+    with span('render', 'simulation'):
+        st.write(df)
+        st.write(f"총 투자 금액: {df['누적 투자 금액 (KRW)'].iloc[-1]} KRW")
+        st.write(f"총 매수량: {df['누적 매수량'].iloc[-1]:.6f} 코인")
+        st.write(f"최종 수익률: {df['수익률 (%)'].iloc[-1]:.2f}%")
 
-    # 성과를 시각화 (막대 그래프로 나타내기)
-    fig = px.bar(df, x='날짜', y='수익률 (%)', title='가상자산 가격 변동 및 투자 수익률')
-    st.plotly_chart(fig)
+        # 성과를 시각화 (막대 그래프로 나타내기)
+        fig = px.bar(df, x='날짜', y='수익률 (%)', title='가상자산 가격 변동 및 투자 수익률')
+        st.plotly_chart(fig)
 
 ########################### 카드 뉴스 ##############################
 
@@ -411,43 +408,40 @@ NEWS_API_KEY = 'ae924ae2406048d39816221dd4632006'
 def get_crypto_news():
     NEWS_API_KEY = 'ae924ae2406048d39816221dd4632006'
     keywords = ["cryptocurrency", "bitcoin", "ethereum", "blockchain"]
-    unique_articles = []
-    seen_titles = set()
+    # 키워드별 요청을 동시에 스케줄러에 넣고, 호스트 요청 한도는 스케줄러가 조절
+    def fetch_keyword_news(keyword):
+        url = f"{NEWSAPI_URL}/v2/everything?q={keyword}&apiKey={NEWS_API_KEY}"
+        try:
+            return cached(f'newsapi:everything:{keyword}', NEWS_TTL, lambda: fetch_json(url))
+        except (requests.exceptions.RequestException, ValueError):
+            return None
 
-    for keyword in keywords:
-        url = f"https://newsapi.org/v2/everything?q={keyword}&apiKey={NEWS_API_KEY}"
-        response = requests.get(url)
-        
-        if response.status_code == 200:
-            news_data = response.json()
-            articles = news_data['articles']
-
-            # 중복 기사 제거 (제목을 기준으로 중복된 기사 제거)
-            for article in articles:
-                title = article.get('title')
-                if title not in seen_titles:
-                    seen_titles.add(title)
-                    unique_articles.append(article)
-        else:
+    with span('fetch', 'newsapi'), ThreadPoolExecutor(max_workers=len(keywords)) as executor:
+        results = list(executor.map(fetch_keyword_news, keywords))
+
+    article_lists = []
+    for keyword, news_data in zip(keywords, results):
+        if news_data is None:
             st.error(f"'{keyword}' 뉴스 데이터를 가져오는 데 실패했습니다.")
+            continue
+        article_lists.append(news_data['articles'])
 
-    return unique_articles
+    # 중복 기사 제거 (제목을 기준으로 중복된 기사 제거)
+    with span('compute', 'dedupe_articles'):
+        return dedupe_articles(*article_lists)
 
 # GDELT API에서 뉴스 데이터를 가져오는 함수
 def get_gdelt_crypto_news():
-    gdelt_url = "https://api.gdeltproject.org/api/v2/doc/doc?query=cryptocurrency&mode=artlist&format=json&maxrecords=100"
-    response = requests.get(gdelt_url)
-
-    if response.status_code == 200:
-        try:
-            news_data = response.json()
-            articles = news_data.get("articles", [])
-            return articles  # 기사 목록 반환
-        except ValueError:
-            st.error("GDELT 뉴스 데이터의 JSON 파싱에 실패했습니다.")
-            return []
-    else:
-        st.error(f"GDELT 뉴스 데이터를 가져오는 데 실패했습니다. 상태 코드: {response.status_code}")
+    gdelt_url = f"{GDELT_API_URL}/api/v2/doc/doc?query=cryptocurrency&mode=artlist&format=json&maxrecords=100"
+    try:
+        with span('fetch', 'gdelt'):
+            news_data = cached('gdelt:artlist:cryptocurrency', NEWS_TTL, lambda: fetch_json(gdelt_url))
+        return news_data.get("articles", [])  # 기사 목록 반환
+    except ValueError:
+        st.error("GDELT 뉴스 데이터의 JSON 파싱에 실패했습니다.")
+        return []
+    except requests.exceptions.RequestException as e:
+        st.error(f"GDELT 뉴스 데이터를 가져오는 데 실패했습니다. {e}")
         return []
 
 # NewsAPI와 GDELT 뉴스 데이터를 통합하는 함수
@@ -455,46 +449,22 @@ def get_combined_news():
     articles = get_crypto_news()  # NewsAPI 뉴스
     gdelt_articles = get_gdelt_crypto_news()  # GDELT 뉴스
 
-    combined_articles = []
-    seen_titles = set()
+    # NewsAPI 기사 다음에 GDELT 기사 추가 (중복 체크)
+    return dedupe_articles(articles, gdelt_articles)
 
-    # NewsAPI 기사 추가 (중복 체크)
-    for article in articles:
-        title = article.get('title')
-        if title not in seen_titles:
-            seen_titles.add(title)
-            combined_articles.append(article)
+# 카드에 표시되는 이미지 너비 (px) - 썸네일은 이 너비로 줄여서 저장
+CARD_IMAGE_WIDTH = 300
+RELATED_IMAGE_WIDTH = 720
 
-    # GDELT 뉴스 기사 추가 (중복 체크)
-    for article in gdelt_articles:
-        title = article.get('title')
-        if title not in seen_titles:
-            seen_titles.add(title)
-            combined_articles.append(article)
-
-    return combined_articles
-
-# 가장 많이 등장하는 단어를 추출하는 함수
-def get_top_keywords(articles, top_n=10):
-    all_text = " ".join([article.get('title', '') for article in articles])
-    words = re.findall(r'\w+', all_text.lower())
-    stop_words = set([
-        'the', 'and', 'of', 'in', 'to', 'a', 'is', 'for', 'on', 'with', 'that', 'by', 'from',
-        'at', 'as', 'an', 'it', 'this', 'be', 'are', 'was', 'were', 'or', 'but', 'not', 'have',
-        'has', 'had', 'can', 'could', 'should', 'would', 'about', 'more', 'some', 'other',
-        'into', 'also', 'which', 'up', 'out', 'if', 'will', 'one', 'all', 'no', 'do', 'does',
-        'did', 'just', 'than', 'so', 'only', 'over', 'its', 'new', 'like', 'how', 'when', 'them',
-        'these', 'those', 'then', 'he', 'she', 'they', 'his', 'her', 'their', 'our', 'us',
-        's', 'de', 'el', 'la', 'в', 'un', 'en', '2024'
-    ])
-    filtered_words = [word for word in words if word not in stop_words]
-    word_counts = Counter(filtered_words)
-    return word_counts.most_common(top_n)
+# 기사 이미지 URL 추출 (NewsAPI: urlToImage, 그 외: image.thumbnail.contentUrl)
+def get_article_image_url(article):
+    return article.get('urlToImage') if 'urlToImage' in article else article.get('image', {}).get('thumbnail', {}).get('contentUrl')
 
 # 뉴스 카드 UI 생성 함수 (리스트 형식 및 이미지 포함)
 def create_news_list_with_images(articles):
     # 실시간 핫토픽 출력 - 실시간 검색어처럼 변경
-    top_keywords = get_top_keywords(articles)
+    with span('compute', 'top_keywords'):
+        top_keywords = get_top_keywords(articles)
     st.markdown("<h2 style='font-size:24px; color:#FF6347; text-align:left; margin-bottom:20px;'>Hot Keyword</h2>", unsafe_allow_html=True)
 
     col1, col2 = st.columns(2)
@@ -517,12 +487,17 @@ def create_news_list_with_images(articles):
     with col2:
         st.markdown(hot_topics_html_2, unsafe_allow_html=True)
 
+    # 만들어 둔 로컬 썸네일이 있으면 사용하고, 없으면 원본 이미지로 먼저 그린 뒤 백그라운드에서 썸네일 생성
+    with span('compute', 'thumbnail_urls'):
+        card_images = thumbnail_urls([get_article_image_url(article) for article in articles[:10]], CARD_IMAGE_WIDTH)
+        related_images = thumbnail_urls([get_article_image_url(article) for article in articles[10:14]], RELATED_IMAGE_WIDTH)
+
     # 주요 뉴스 리스트 출력
     for i, article in enumerate(articles[:10]):
         title = article.get('title')
         translated_title = title if title else ''
         url = article.get('url')
-        image_url = article.get('urlToImage') if 'urlToImage' in article else article.get('image', {}).get('thumbnail', {}).get('contentUrl')
+        image_url = card_images[i]
         description = article.get('description', '설명이 없습니다.')
         translated_description = description if description else ''
 
@@ -547,7 +522,7 @@ def create_news_list_with_images(articles):
     if len(articles) > 10:
         st.markdown("<h2 style='font-size:24px; color:#007ACC; text-align:left; margin-top: 40px;'>관련 뉴스</h2>", unsafe_allow_html=True)
         for i in range(10, min(14, len(articles))):
-            image_url = articles[i].get('urlToImage') if 'urlToImage' in articles[i] else articles[i].get('image', {}).get('thumbnail', {}).get('contentUrl')
+            image_url = related_images[i - 10]
             title = articles[i].get('title')
             translated_title = title if title else ''
             url = articles[i].get('url')
@@ -574,7 +549,8 @@ def show_card_news():
     articles = get_combined_news()
 
     if articles:
-        create_news_list_with_images(articles)
+        with span('render', 'card_news'):
+            create_news_list_with_images(articles)
     else:
         st.write("표시할 뉴스가 없습니다.")
 
@@ -653,15 +629,14 @@ def show_glossary():
     if search_term:
         try:
             # 네이버 검색 API를 사용하여 검색 결과 가져오기
-            url = "https://openapi.naver.com/v1/search/encyc.json"
+            url = f"{NAVER_API_URL}/v1/search/encyc.json"
             headers = {
                 "X-Naver-Client-Id": NAVER_CLIENT_ID,
                 "X-Naver-Client-Secret": NAVER_CLIENT_SECRET
             }
             params = {"query": search_term, "display": 5}
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            with span('fetch', 'naver'):
+                data = cached(f'naver:encyc:{search_term}', GLOSSARY_TTL, lambda: fetch_json(url, headers=headers, params=params))
             
             if data['items']:
                 descriptions = []
@@ -680,7 +655,8 @@ def show_glossary():
                     """)
                 
                 full_description = '\n'.join(descriptions)
-                st.markdown(full_description, unsafe_allow_html=True)
+                with span('render', 'glossary'):
+                    st.markdown(full_description, unsafe_allow_html=True)
             else:
                 st.warning(f"'{search_term}'에 대한 정보를 찾을 수 없습니다.")
         except requests.exceptions.HTTPError as http_err:
@@ -732,38 +708,66 @@ def footer():
         unsafe_allow_html=True
     )
 
+# 사이드바 성능 진단 패널 (단계별 자체 지연 시간, 업스트림 호출 / 전송량 / 지연 시간, 캐시 적중률)
+def show_diagnostics():
+    summary = metrics.snapshot()
+    with st.sidebar:
+        st.markdown("**성능 진단**")
+        if metrics.SAMPLE_RATE <= 0:
+            st.caption("span 샘플링이 꺼져 있습니다 (BITALGO_TRACE_SAMPLE_RATE=0).")
+        hit_ratio = summary['cache_hit_ratio']
+        st.metric("캐시 적중률", f"{hit_ratio * 100:.1f}%" if hit_ratio is not None else "-")
+        if summary['upstream_calls']:
+            st.dataframe(pd.DataFrame({
+                '호출 수': pd.Series(summary['upstream_calls']),
+                '전송량 (KB)': pd.Series(summary['upstream_bytes']) / 1024,
+                '평균 (ms)': pd.Series({key: value['avg_ms'] for key, value in summary['upstream_latency'].items()}),
+            }).round(1))
+        if summary['spans']:
+            # 하위 단계 시간을 뺀 자체 시간 기준 (중첩된 단계가 두 번 계산되지 않도록)
+            df_spans = pd.DataFrame(summary['spans']).reindex(columns=['kind', 'name', 'count', 'self_avg_ms', 'self_p95_ms', 'total_avg_ms'])
+            st.dataframe(df_spans.round(1), hide_index=True)
+
 # 페이지 라우팅
 with st.sidebar:
     selected = option_menu(
         menu_title="메뉴 선택",  # required
-        options=["프로젝트 소개", "실시간 가상자산 시세", "모의 투자", "카드 뉴스", "알고있으면 좋은 경제 지식", "경제용어사전", "가이드", "문의 및 피드백"],  # required
-        icons=["house", "graph-up", "wallet", "newspaper", "book", "question-circle", "envelope"],  # optional
+        options=["프로젝트 소개", "실시간 가상자산 시세", "시장 분석", "모의 투자", "카드 뉴스", "알고있으면 좋은 경제 지식", "경제용어사전", "가이드", "문의 및 피드백"],  # required
+        icons=["house", "graph-up", "grid-3x3", "wallet", "newspaper", "book", "question-circle", "envelope"],  # optional
         menu_icon="cast",  # optional
         default_index=0,  # optional
     )
+    diagnostics_enabled = st.checkbox("성능 진단", value=False)
 
 # 선택된 메뉴에 따라 페이지 라우팅
-if selected == "프로젝트 소개":
-    show_project_intro()
-    footer()
-elif selected == "실시간 가상자산 시세":
-    show_live_prices()
-    footer()
-elif selected == "모의 투자":
-    show_investment_performance()
-    footer()
-elif selected == "카드 뉴스":
-    show_card_news()  # 카드 뉴스 페이지 함수 호출
-    footer()
-elif selected == "알고있으면 좋은 경제 지식":
-    show_edu()
-    footer()
-elif selected == "경제용어사전":
-    show_glossary()
-    footer()
-elif selected == "가이드":
-    show_guide()
-    footer()
-elif selected == "문의 및 피드백":
-    show_feedback()
-    footer()
+with span('page', selected):
+    if selected == "프로젝트 소개":
+        show_project_intro()
+        footer()
+    elif selected == "실시간 가상자산 시세":
+        show_live_prices()
+        footer()
+    elif selected == "시장 분석":
+        show_market_analytics()
+        footer()
+    elif selected == "모의 투자":
+        show_investment_performance()
+        footer()
+    elif selected == "카드 뉴스":
+        show_card_news()  # 카드 뉴스 페이지 함수 호출
+        footer()
+    elif selected == "알고있으면 좋은 경제 지식":
+        show_edu()
+        footer()
+    elif selected == "경제용어사전":
+        show_glossary()
+        footer()
+    elif selected == "가이드":
+        show_guide()
+        footer()
+    elif selected == "문의 및 피드백":
+        show_feedback()
+        footer()
+
+if diagnostics_enabled:
+    show_diagnostics()
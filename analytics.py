@@ -0,0 +1,153 @@
+import os
+import numpy as np
+import pandas as pd
+
+########################### 시장 분석 (도미넌스 / 변동성 / 상관관계) ##############################
+
+# 가상자산은 24시간 365일 거래되므로 연율화 기준 기간은 365일
+PERIODS_PER_YEAR = {'24h': 365, '12h': 365 * 2, '6h': 365 * 4, '1h': 365 * 24, '30m': 365 * 48, '10m': 365 * 144}
+
+# 증분 갱신에서 누적되는 부동소수점 오차를 없애기 위해 전체 재계산을 수행하는 주기 (업데이트 횟수)
+RESYNC_EVERY = 500
+
+# 유통량 CSV 경로 (코인, 유통량) - 파일이 있을 때만 시가총액 도미넌스를 계산
+CIRCULATING_SUPPLY_PATH = './mnt/data/circulating_supply.csv'
+
+
+# 유통량 데이터 로드 함수 (파일이 없으면 빈 딕셔너리)
+def load_circulating_supply(path=CIRCULATING_SUPPLY_PATH):
+    if not os.path.exists(path):
+        return {}
+    df = pd.read_csv(path)
+    return dict(zip(df['코인'], df['유통량'].astype(float)))
+
+
+# ALL_KRW 시세 데이터로 거래대금 / 시가총액 도미넌스 계산
+def compute_dominance(crypto_info, circulating_supply=None):
+    symbols = [key for key in crypto_info if key != 'date']
+    df = pd.DataFrame({
+        '코인': symbols,
+        '현재가 (KRW)': pd.to_numeric([crypto_info[s].get('closing_price') for s in symbols], errors='coerce'),
+        '거래대금 (24H, KRW)': pd.to_numeric([crypto_info[s].get('acc_trade_value_24H') for s in symbols], errors='coerce'),
+    }).fillna(0.0)
+
+    total_value = df['거래대금 (24H, KRW)'].sum()
+    df['거래대금 도미넌스 (%)'] = df['거래대금 (24H, KRW)'] / total_value * 100 if total_value else 0.0
+
+    if circulating_supply:
+        df['시가총액 (KRW)'] = df['현재가 (KRW)'] * df['코인'].map(circulating_supply).fillna(0.0)
+        total_cap = df['시가총액 (KRW)'].sum()
+        df['시가총액 도미넌스 (%)'] = df['시가총액 (KRW)'] / total_cap * 100 if total_cap else 0.0
+        sort_key = '시가총액 도미넌스 (%)'
+    else:
+        sort_key = '거래대금 도미넌스 (%)'
+
+    return df.sort_values(sort_key, ascending=False).reset_index(drop=True)
+
+
+# 코인별 캔들 데이터({코인: [[시간, 시가, 종가, 고가, 저가, 거래량], ...]})를 종가 행렬(시간 x 코인)로 변환
+def build_close_matrix(candles):
+    columns = {}
+    for symbol, entries in candles.items():
+        if not entries:
+            continue
+        arr = np.asarray(entries, dtype=object)
+        index = pd.to_datetime(arr[:, 0].astype(np.int64), unit='ms')
+        columns[symbol] = pd.Series(arr[:, 2].astype(float), index=index)
+    if not columns:
+        return pd.DataFrame()
+    close = pd.DataFrame(columns).sort_index()
+    # 상장 전/거래 없는 구간은 직전 종가로 채움
+    return close.ffill()
+
+
+# 로그 수익률 계산 (결측 수익률은 0 으로 처리하여 행렬 연산이 끊기지 않도록 함)
+def compute_returns(close):
+    returns = np.log(close).diff().iloc[1:]
+    return returns.replace([np.inf, -np.inf], np.nan).fillna(0.0)
+
+
+# 연율화된 롤링 변동성 (%)
+def rolling_volatility(returns, window=30, interval='24h'):
+    periods = PERIODS_PER_YEAR.get(interval, 365)
+    return returns.rolling(window=window).std() * np.sqrt(periods) * 100
+
+
+# 롤링 상관관계 행렬
+# 창(window) 안의 수익률 합과 교차곱 합(X^T X)을 유지하여,
+# 새 봉이 들어올 때마다 빠지는 봉과 들어오는 봉의 외적만 더하고 빼서 O(N^2)로 갱신합니다.
+# 마지막 봉은 아직 진행 중일 수 있으므로(같은 시각에 종가가 계속 바뀜) refresh 시 현재 값으로 교체합니다.
+class RollingCorrelation:
+    def __init__(self, returns, window=30):
+        values = np.asarray(returns, dtype=float)
+        if values.ndim != 2 or values.shape[0] < window:
+            raise ValueError(f"상관관계 계산에는 최소 {window}개의 수익률 데이터가 필요합니다.")
+        self.columns = list(returns.columns) if hasattr(returns, 'columns') else list(range(values.shape[1]))
+        self.window = window
+        # 마지막으로 반영한 봉의 시각 (DataFrame 으로 만든 경우)
+        self.last = returns.index[-1] if hasattr(returns, 'index') else None
+        # 원형 버퍼: _pos 위치가 가장 오래된 봉
+        self._buffer = np.nan_to_num(values[-window:]).copy()
+        self._pos = 0
+        self._updates = 0
+        self._resync()
+
+    # 버퍼 전체로 합계를 다시 계산 (한 번의 벡터화된 공분산 계산)
+    def _resync(self):
+        self._sum = self._buffer.sum(axis=0)
+        self._cross = self._buffer.T @ self._buffer
+
+    # 버퍼의 position 위치 값을 row 로 바꾸고 합계에 차이만 반영
+    def _replace(self, position, row):
+        row = np.nan_to_num(np.asarray(row, dtype=float))
+        old = self._buffer[position]
+        self._sum += row - old
+        self._cross += np.outer(row, row) - np.outer(old, old)
+        self._buffer[position] = row
+        self._updates += 1
+        if self._updates % RESYNC_EVERY == 0:
+            self._resync()
+
+    # 새 수익률 한 줄(코인 순서는 columns 와 동일)을 반영
+    def update(self, row):
+        position = self._pos
+        self._pos = (self._pos + 1) % self.window
+        self._replace(position, row)
+
+    # 가장 최근에 반영한 줄을 새 값으로 교체 (진행 중인 봉의 종가가 바뀐 경우)
+    def replace_last(self, row):
+        self._replace((self._pos - 1) % self.window, row)
+
+    # 여러 줄을 순서대로 반영
+    def extend(self, rows):
+        for row in np.asarray(rows, dtype=float):
+            self.update(row)
+
+    # 새로 받은 수익률 표 반영: 마지막으로 반영한 봉은 현재 값으로 교체하고 그 이후 봉만 추가
+    # (마지막 봉이 표에 없으면 증분 갱신이 불가능하므로 False 반환)
+    def refresh(self, returns):
+        if self.last is None or self.last not in returns.index:
+            return False
+        self.replace_last(returns.loc[self.last].values)
+        self.extend(returns[returns.index > self.last].values)
+        self.last = returns.index[-1]
+        return True
+
+    # 현재 창의 상관관계 행렬 (코인 x 코인)
+    def matrix(self):
+        n = self.window
+        mean = self._sum / n
+        cov = self._cross / n - np.outer(mean, mean)
+        std = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = cov / np.outer(std, std)
+        # 변동이 없는 코인(표준편차 0)은 상관관계를 정의할 수 없으므로 NaN
+        corr[~np.isfinite(corr)] = np.nan
+        np.clip(corr, -1.0, 1.0, out=corr)
+        np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+# 전체 상관관계 행렬을 한 번에 계산
+def correlation_matrix(returns, window=30):
+    return RollingCorrelation(returns, window=window).matrix()
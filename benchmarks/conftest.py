@@ -0,0 +1,65 @@
+import json
+import os
+import sys
+
+import pytest
+
+########################### 마이크로 벤치마크 ##############################
+# 기록된 업스트림 응답(fixtures/*.json)으로 주요 연산 경로를 오프라인에서 측정합니다.
+#   pip install -r requirements-dev.txt
+#   python -m pytest benchmarks --benchmark-json=bench_output.json   # 결과를 JSON 으로 저장
+#   python -m pytest benchmarks --benchmark-autosave                 # .benchmarks/ 에 실행 기록 누적
+#   pytest-benchmark compare                                         # 저장된 실행 기록 비교
+# 픽스처는 benchmarks/record_fixtures.py 로 다시 기록할 수 있습니다.
+
+pytest.importorskip('pytest_benchmark')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(ROOT, 'benchmarks', 'fixtures')
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+NEWS_KEYWORDS = ["cryptocurrency", "bitcoin", "ethereum", "blockchain"]
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope='session')
+def ticker_all_krw():
+    return read_fixture('bithumb_ticker_all_krw.json')['data']
+
+
+@pytest.fixture(scope='session')
+def market_all():
+    return read_fixture('bithumb_market_all.json')
+
+
+@pytest.fixture(scope='session')
+def candles_1m():
+    return read_fixture('bithumb_candlestick_btc_1m.json')['data']
+
+
+@pytest.fixture(scope='session')
+def candles_24h():
+    return read_fixture('bithumb_candlestick_btc_24h.json')['data']
+
+
+@pytest.fixture(scope='session')
+def newsapi_pages():
+    return [read_fixture(f'newsapi_everything_{keyword}.json')['articles'] for keyword in NEWS_KEYWORDS]
+
+
+@pytest.fixture(scope='session')
+def gdelt_articles():
+    return read_fixture('gdelt_artlist.json')['articles']
+
+
+@pytest.fixture(scope='session')
+def korean_names():
+    import pandas as pd
+    df = pd.read_csv(os.path.join(ROOT, 'mnt', 'data', 'crypto_korean_names.csv'))
+    return dict(zip(df['코인'], df['코인 이름']))
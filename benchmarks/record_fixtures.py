@@ -0,0 +1,168 @@
+import argparse
+import csv
+import json
+import os
+import random
+import time
+
+########################### 벤치마크 픽스처 기록 ##############################
+# 벤치마크가 오프라인으로 실행될 수 있도록 업스트림 응답을 JSON 파일로 저장합니다.
+#   python benchmarks/record_fixtures.py              # 실제 API 응답 기록
+#   python benchmarks/record_fixtures.py --synthetic  # 네트워크 없이 같은 형식의 응답 생성 (seed 고정)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(ROOT, 'benchmarks', 'fixtures')
+
+NEWS_KEYWORDS = ["cryptocurrency", "bitcoin", "ethereum", "blockchain"]
+CANDLE_LENGTH = 5000
+
+NEWS_API_KEY = 'ae924ae2406048d39816221dd4632006'
+NAVER_CLIENT_ID = 'BwZoRgXSJQ3l55bVrIKk'
+NAVER_CLIENT_SECRET = 'd_sagtQMyV'
+
+
+def save(name, data):
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    with open(os.path.join(FIXTURE_DIR, name), 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    print(f"saved {name}")
+
+
+# 실제 API 응답 기록
+def record_live():
+    import requests
+
+    def get(url, **kwargs):
+        response = requests.get(url, timeout=30, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    save('bithumb_ticker_all_krw.json', get("https://api.bithumb.com/public/ticker/ALL_KRW"))
+    save('bithumb_market_all.json', get("https://api.bithumb.com/v1/market/all?isDetails=false", headers={"accept": "application/json"}))
+    save('bithumb_candlestick_btc_1m.json', get("https://api.bithumb.com/public/candlestick/BTC_KRW/1m"))
+    save('bithumb_candlestick_btc_24h.json', get("https://api.bithumb.com/public/candlestick/BTC_KRW/24h"))
+    for keyword in NEWS_KEYWORDS:
+        save(f'newsapi_everything_{keyword}.json', get(f"https://newsapi.org/v2/everything?q={keyword}&apiKey={NEWS_API_KEY}"))
+    save('gdelt_artlist.json', get("https://api.gdeltproject.org/api/v2/doc/doc?query=cryptocurrency&mode=artlist&format=json&maxrecords=100"))
+    save('naver_encyc.json', get(
+        "https://openapi.naver.com/v1/search/encyc.json",
+        headers={"X-Naver-Client-Id": NAVER_CLIENT_ID, "X-Naver-Client-Secret": NAVER_CLIENT_SECRET},
+        params={"query": "비트코인", "display": 5}
+    ))
+
+
+def load_coin_names():
+    with open(os.path.join(ROOT, 'mnt', 'data', 'crypto_korean_names.csv'), encoding='utf-8-sig') as f:
+        return [(row['코인'], row['코인 이름']) for row in csv.DictReader(f)]
+
+
+def synthetic_candles(rng, length, step_ms, start_price):
+    end = 1729000000000
+    price = start_price
+    rows = []
+    for i in range(length):
+        open_price = price
+        price = max(1.0, price * (1 + rng.gauss(0, 0.02)))
+        high = max(open_price, price) * (1 + abs(rng.gauss(0, 0.005)))
+        low = min(open_price, price) * (1 - abs(rng.gauss(0, 0.005)))
+        volume = abs(rng.gauss(1000, 300))
+        rows.append([end - (length - i) * step_ms, f"{open_price:.0f}", f"{price:.0f}", f"{high:.0f}", f"{low:.0f}", f"{volume:.8f}"])
+    return {"status": "0000", "data": rows}
+
+
+def synthetic_title(rng, words):
+    return ' '.join(rng.choice(words) for _ in range(rng.randint(6, 12))).capitalize()
+
+
+# 같은 형식의 응답 생성 (네트워크 없이 벤치마크 준비)
+def record_synthetic(seed=20241031):
+    rng = random.Random(seed)
+    coins = load_coin_names()
+
+    ticker = {}
+    for symbol, _ in coins:
+        closing = rng.lognormvariate(6, 3)
+        rate = rng.gauss(0, 4)
+        ticker[symbol] = {
+            "opening_price": f"{closing / (1 + rate / 100):.4f}",
+            "closing_price": f"{closing:.4f}",
+            "min_price": f"{closing * 0.95:.4f}",
+            "max_price": f"{closing * 1.05:.4f}",
+            "units_traded": f"{rng.uniform(1e2, 1e9):.8f}",
+            "acc_trade_value": f"{rng.uniform(1e6, 1e11):.4f}",
+            "prev_closing_price": f"{closing / (1 + rate / 100):.4f}",
+            "units_traded_24H": f"{rng.uniform(1e2, 1e9):.8f}",
+            "acc_trade_value_24H": f"{rng.uniform(1e6, 1e11):.4f}",
+            "fluctate_24H": f"{closing * rate / 100:.4f}",
+            "fluctate_rate_24H": f"{rate:.2f}",
+        }
+    ticker["date"] = "1729000000000"
+    save('bithumb_ticker_all_krw.json', {"status": "0000", "data": ticker})
+
+    markets = [{"market": f"KRW-{symbol}", "korean_name": name, "english_name": symbol.title()} for symbol, name in coins]
+    markets += [{"market": f"BTC-{symbol}", "korean_name": name, "english_name": symbol.title()} for symbol, name in coins[:120]]
+    save('bithumb_market_all.json', markets)
+
+    save('bithumb_candlestick_btc_1m.json', synthetic_candles(rng, CANDLE_LENGTH, 60 * 1000, 90000000))
+    save('bithumb_candlestick_btc_24h.json', synthetic_candles(rng, 3000, 24 * 3600 * 1000, 9000000))
+
+    words = ("bitcoin ethereum crypto market price rally etf sec regulation blockchain token defi stablecoin "
+             "exchange whale halving miners surge drop analyst investors fund trading record high low week "
+             "the and of in to for on with is new").split()
+    shared_titles = [synthetic_title(rng, words) for _ in range(60)]
+    for keyword in NEWS_KEYWORDS:
+        articles = []
+        for i in range(100):
+            # 키워드 사이에 겹치는 기사가 있도록 일부 제목을 공유
+            title = rng.choice(shared_titles) if rng.random() < 0.3 else synthetic_title(rng, words + [keyword])
+            articles.append({
+                "source": {"id": None, "name": f"Source {i % 17}"},
+                "author": f"Author {i % 23}",
+                "title": title,
+                "description": synthetic_title(rng, words) + '.',
+                "url": f"https://news.example.com/{keyword}/{i}",
+                "urlToImage": f"https://images.example.com/{keyword}/{i}.jpg",
+                "publishedAt": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(1729000000 - i * 600)),
+                "content": synthetic_title(rng, words) + '…',
+            })
+        save(f'newsapi_everything_{keyword}.json', {"status": "ok", "totalResults": len(articles), "articles": articles})
+
+    gdelt = []
+    for i in range(100):
+        gdelt.append({
+            "url": f"https://gdelt.example.com/article/{i}",
+            "url_mobile": "",
+            "title": rng.choice(shared_titles) if rng.random() < 0.2 else synthetic_title(rng, words),
+            "seendate": time.strftime('%Y%m%dT%H%M%SZ', time.gmtime(1729000000 - i * 900)),
+            "socialimage": f"https://gdelt.example.com/image/{i}.jpg",
+            "domain": "gdelt.example.com",
+            "language": "English",
+            "sourcecountry": "United States",
+        })
+    save('gdelt_artlist.json', {"articles": gdelt})
+
+    save('naver_encyc.json', {
+        "lastBuildDate": "Tue, 15 Oct 2024 12:00:00 +0900",
+        "total": 5,
+        "start": 1,
+        "display": 5,
+        "items": [
+            {
+                "title": f"<b>비트코인</b> 항목 {i}",
+                "link": f"https://terms.naver.com/entry.naver?docId={1000 + i}",
+                "description": "<b>비트코인</b>은 블록체인 기술을 기반으로 한 가상화폐입니다. " * 3,
+                "thumbnail": f"https://dbscthumb-phinf.pstatic.net/{i}.jpg",
+            }
+            for i in range(5)
+        ],
+    })
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="벤치마크용 업스트림 응답 픽스처 기록")
+    parser.add_argument('--synthetic', action='store_true', help="네트워크 없이 같은 형식의 응답 생성")
+    args = parser.parse_args()
+    if args.synthetic:
+        record_synthetic()
+    else:
+        record_live()
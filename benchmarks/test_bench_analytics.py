@@ -0,0 +1,85 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import RollingCorrelation, compute_dominance, correlation_matrix
+from charting import aggregate_bars, lttb
+
+COIN_COUNTS = [50, 300]
+WINDOW = 30
+
+
+def synthetic_returns(coins, length=WINDOW + 100):
+    rng = np.random.default_rng(coins)
+    return pd.DataFrame(rng.normal(0, 0.02, (length, coins)), columns=[f'C{i}' for i in range(coins)])
+
+
+@pytest.mark.benchmark(group='dominance')
+def test_compute_dominance(benchmark, ticker_all_krw):
+    df = benchmark(compute_dominance, ticker_all_krw)
+    assert abs(df['거래대금 도미넌스 (%)'].sum() - 100) < 1e-6
+
+
+@pytest.mark.benchmark(group='correlation')
+@pytest.mark.parametrize('coins', COIN_COUNTS)
+def test_correlation_matrix(benchmark, coins):
+    returns = synthetic_returns(coins)
+    corr = benchmark(correlation_matrix, returns, WINDOW)
+    assert corr.shape == (coins, coins)
+
+
+@pytest.mark.benchmark(group='correlation')
+@pytest.mark.parametrize('coins', COIN_COUNTS)
+def test_rolling_correlation_update(benchmark, coins):
+    returns = synthetic_returns(coins)
+    engine = RollingCorrelation(returns.iloc[:WINDOW], window=WINDOW)
+    rows = itertools.cycle(returns.values[WINDOW:])
+
+    def update_and_read():
+        engine.update(next(rows))
+        return engine.matrix()
+
+    corr = benchmark(update_and_read)
+    assert corr.shape == (coins, coins)
+
+
+# 진행 중인 마지막 봉의 값이 바뀌고 새 봉이 추가되어도 전체 재계산과 같은 결과인지 확인
+def test_rolling_correlation_refresh_matches_full_recompute():
+    returns = synthetic_returns(20)
+    returns.index = pd.date_range('2024-10-01', periods=len(returns), freq='h')
+    engine = RollingCorrelation(returns.iloc[:-3], window=WINDOW)
+
+    # 같은 시각의 마지막 봉 값만 바뀐 경우
+    refreshed = returns.iloc[:-3].copy()
+    refreshed.iloc[-1] = returns.iloc[-1].values * 5
+    assert engine.refresh(refreshed)
+    pd.testing.assert_frame_equal(engine.matrix(), correlation_matrix(refreshed, WINDOW))
+
+    # 마지막 봉이 확정되고 새 봉이 추가된 경우 (새 마지막 봉도 진행 중)
+    refreshed = returns.copy()
+    refreshed.iloc[-1] = returns.iloc[-1].values * -3
+    assert engine.refresh(refreshed)
+    pd.testing.assert_frame_equal(engine.matrix(), correlation_matrix(refreshed, WINDOW))
+
+    # 마지막으로 반영한 봉이 표에 없으면 증분 갱신 불가
+    assert not engine.refresh(returns.iloc[:10])
+
+
+@pytest.mark.benchmark(group='lttb')
+def test_lttb(benchmark, candles_1m):
+    x = np.array([entry[0] for entry in candles_1m], dtype=float)
+    y = np.array([float(entry[2]) for entry in candles_1m])
+    indices = benchmark(lttb, x, y, 1200)
+    assert len(indices) == 1200
+
+
+@pytest.mark.benchmark(group='lttb')
+def test_aggregate_bars(benchmark, candles_1m):
+    x = np.array([entry[0] for entry in candles_1m], dtype=float)
+    volume = np.array([float(entry[5]) for entry in candles_1m])
+    bar_x, bar_y = benchmark(aggregate_bars, x, volume, 1200)
+    # 구간별로 합산하므로 전체 거래량은 그대로 유지
+    assert len(bar_x) == 1200
+    assert bar_y.sum() == pytest.approx(volume.sum())
@@ -0,0 +1,12 @@
+import importlib
+
+import pytest
+
+list_app = importlib.import_module('list')
+
+
+@pytest.mark.benchmark(group='processed_data')
+def test_build_processed_data(benchmark, market_all, ticker_all_krw):
+    processed_data = benchmark(list_app.build_processed_data, market_all, ticker_all_krw)
+    assert processed_data
+    assert all(item['market'].startswith('KRW-') for item in processed_data)
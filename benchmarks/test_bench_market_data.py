@@ -0,0 +1,33 @@
+import pytest
+
+from market_data import add_technical_indicators, build_price_table, candles_to_frame
+
+CANDLE_LENGTHS = [200, 1000, 5000]
+
+
+@pytest.mark.benchmark(group='candles_to_frame')
+@pytest.mark.parametrize('length', CANDLE_LENGTHS)
+def test_candles_to_frame(benchmark, candles_1m, length):
+    df = benchmark(candles_to_frame, candles_1m[-length:])
+    assert len(df) == length
+
+
+@pytest.mark.benchmark(group='indicators')
+@pytest.mark.parametrize('length', CANDLE_LENGTHS)
+def test_add_technical_indicators(benchmark, candles_1m, length):
+    df = candles_to_frame(candles_1m[-length:])
+    result = benchmark(lambda: add_technical_indicators(df.copy()))
+    assert {'MACD', 'RSI (14)', 'CCI', '볼린저 상단'} <= set(result.columns)
+
+
+@pytest.mark.benchmark(group='indicators')
+def test_add_technical_indicators_daily(benchmark, candles_24h):
+    df = candles_to_frame(candles_24h)
+    result = benchmark(lambda: add_technical_indicators(df.copy()))
+    assert len(result) == len(candles_24h)
+
+
+@pytest.mark.benchmark(group='price_table')
+def test_build_price_table(benchmark, ticker_all_krw, korean_names):
+    df = benchmark(build_price_table, ticker_all_krw, korean_names)
+    assert len(df) == len(ticker_all_krw) - 1
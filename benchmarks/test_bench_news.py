@@ -0,0 +1,17 @@
+import pytest
+
+from news import dedupe_articles, get_top_keywords
+
+
+@pytest.mark.benchmark(group='news')
+def test_dedupe_articles(benchmark, newsapi_pages, gdelt_articles):
+    articles = benchmark(dedupe_articles, *newsapi_pages, gdelt_articles)
+    titles = [article.get('title') for article in articles]
+    assert len(titles) == len(set(titles))
+
+
+@pytest.mark.benchmark(group='news')
+def test_get_top_keywords(benchmark, newsapi_pages, gdelt_articles):
+    articles = dedupe_articles(*newsapi_pages, gdelt_articles)
+    top_keywords = benchmark(get_top_keywords, articles)
+    assert len(top_keywords) == 10
@@ -0,0 +1,16 @@
+import json
+import os
+
+import pytest
+
+from conftest import FIXTURE_DIR
+
+FIXTURES = sorted(name for name in os.listdir(FIXTURE_DIR) if name.endswith('.json'))
+
+
+@pytest.mark.benchmark(group='json_parse')
+@pytest.mark.parametrize('name', FIXTURES)
+def test_parse_fixture(benchmark, name):
+    with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+        payload = f.read()
+    assert benchmark(json.loads, payload)
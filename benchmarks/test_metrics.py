@@ -0,0 +1,32 @@
+import pytest
+
+from metrics import BUCKETS, Histogram
+
+
+def histogram_of(values):
+    histogram = Histogram()
+    for value in values:
+        histogram.observe(value)
+    return histogram
+
+
+def test_quantile_of_empty_histogram_is_none():
+    assert Histogram().quantile(0.95) is None
+
+
+def test_quantile_interpolates_within_bucket():
+    # 0.25~0.5 구간에 100개 -> 95번째는 구간의 95% 지점
+    histogram = histogram_of([0.3] * 100)
+    assert histogram.quantile(0.95) == pytest.approx(0.25 + 0.25 * 0.95)
+    assert histogram.quantile(0.5) == pytest.approx(0.375)
+
+
+def test_quantile_first_bucket_starts_at_zero():
+    histogram = histogram_of([0.0005] * 10)
+    assert histogram.quantile(0.5) == pytest.approx(BUCKETS[0] / 2)
+
+
+def test_quantile_in_overflow_bucket_is_capped_at_last_bound():
+    histogram = histogram_of([0.3] * 90 + [30.0] * 10)
+    assert histogram.quantile(0.95) == BUCKETS[-1]
+    assert histogram.quantile(0.5) < BUCKETS[-1]
@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+import scheduler
+from loadtest.mock_upstream import MockUpstream, start_in_thread
+
+
+# 첫 요청에만 429 와 Retry-After 를 돌려주는 대체 서버
+class RateLimitedOnce(MockUpstream):
+    def __init__(self, retry_after):
+        super().__init__()
+        self.retry_after_value = retry_after
+        self.request_times = []
+
+    def handle(self, handler):
+        self.request_times.append(time.monotonic())
+        if len(self.request_times) == 1:
+            return 429, 'application/json', b'{}', {'Retry-After': self.retry_after_value}
+        return super().handle(handler)
+
+
+@pytest.fixture
+def upstream():
+    mock = MockUpstream()
+    server = start_in_thread(mock)
+    yield mock
+    server.shutdown()
+
+
+def test_identical_requests_are_merged(upstream):
+    # 토큰이 없어 첫 요청이 큐에 머무는 동안 같은 요청을 다시 넣음
+    requests_scheduler = scheduler.RequestScheduler(limits={'test': (2, 1)})
+    url = f"{upstream.base_url}/bithumb/public/ticker/BTC_KRW"
+    requests_scheduler.request(f"{upstream.base_url}/bithumb/public/ticker/ETH_KRW", queue='test')
+    first = requests_scheduler.submit(url, queue='test')
+    second = requests_scheduler.submit(url, queue='test')
+
+    assert first is second
+    assert first.result(timeout=10).status_code == 200
+    assert upstream.stats()['calls']['bithumb'] == 2
+
+
+def test_interactive_requests_overtake_queued_background_requests(upstream):
+    requests_scheduler = scheduler.RequestScheduler(limits={'test': (5, 1)})
+    base = f"{upstream.base_url}/bithumb/public/ticker"
+    requests_scheduler.request(f"{base}/ETH_KRW", queue='test')
+
+    order = []
+
+    def submit(symbol, priority):
+        future = requests_scheduler.submit(f"{base}/{symbol}_KRW", priority=priority, queue='test')
+        future.add_done_callback(lambda _: order.append(symbol))
+        return future
+
+    futures = [submit('XRP', scheduler.SWEEP), submit('ADA', scheduler.BACKGROUND), submit('BTC', scheduler.INTERACTIVE)]
+    for future in futures:
+        future.result(timeout=10)
+    assert order == ['BTC', 'ADA', 'XRP']
+
+
+def test_retry_after_pauses_the_queue_and_retries():
+    mock = RateLimitedOnce(retry_after='0.5')
+    server = start_in_thread(mock)
+    try:
+        requests_scheduler = scheduler.RequestScheduler(limits={'test': (100, 100)})
+        response = requests_scheduler.request(f"{mock.base_url}/bithumb/public/ticker/BTC_KRW", queue='test')
+    finally:
+        server.shutdown()
+
+    assert response.status_code == 200
+    assert len(mock.request_times) == 2
+    assert mock.request_times[1] - mock.request_times[0] >= 0.5
+
+
+@pytest.mark.parametrize('value, expected', [('3', 3.0), ('0.5', 0.5), (None, 1.0), ('not a date', 1.0)])
+def test_parse_retry_after(value, expected):
+    assert scheduler.parse_retry_after(value) == expected
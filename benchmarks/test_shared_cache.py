@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+
+import shared_cache
+from shared_cache import MemoryCache, RefreshFailed, SQLiteCache
+
+THREADS = 8
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def cache(request, tmp_path, monkeypatch):
+    backend = MemoryCache() if request.param == 'memory' else SQLiteCache(str(tmp_path / 'cache.sqlite3'))
+    monkeypatch.setattr(shared_cache, '_cache', backend)
+    return backend
+
+
+# 여러 스레드에서 동시에 cached_entry 호출 (결과 또는 예외 이름, 걸린 시간 반환)
+def run_concurrently(key, ttl, loader, threads=THREADS):
+    barrier = threading.Barrier(threads)
+    results = []
+    lock = threading.Lock()
+
+    def worker():
+        barrier.wait()
+        start = time.perf_counter()
+        try:
+            result = shared_cache.cached_entry(key, ttl, loader).value
+        except Exception as e:
+            result = type(e).__name__
+        with lock:
+            results.append((result, time.perf_counter() - start))
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for worker_thread in workers:
+        worker_thread.start()
+    for worker_thread in workers:
+        worker_thread.join()
+    return results
+
+
+def test_versions_increase_on_each_set(cache):
+    assert cache.set('key', {'a': 1}, ttl=60) == 1
+    assert cache.set('key', {'a': 2}, ttl=60) == 2
+    assert cache.get('key').value == {'a': 2}
+
+
+def test_concurrent_callers_share_one_load(cache):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.2)
+        return {'price': 1}
+
+    results = run_concurrently('ticker', 60, loader)
+    assert len(calls) == 1
+    assert [result for result, _ in results] == [{'price': 1}] * THREADS
+
+
+def test_expired_entry_is_served_while_another_owner_refreshes(cache):
+    cache.set('ticker', {'price': 1}, ttl=0)
+    assert cache.acquire_lease('ticker', 'other-process')
+
+    entry = shared_cache.cached_entry('ticker', 0, lambda: pytest.fail("리스 없이 loader 호출"))
+    assert entry.value == {'price': 1}
+
+
+def test_failed_refresh_fails_waiters_without_timeout(cache):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.2)
+        raise ValueError("upstream error")
+
+    results = run_concurrently('news', 60, loader, threads=3)
+    assert len(calls) == 1
+    assert sorted(result for result, _ in results) == ['RefreshFailed', 'RefreshFailed', 'ValueError']
+    assert max(elapsed for _, elapsed in results) < shared_cache.WAIT_TIMEOUT / 2
+
+    # 실패 표시가 남아 있는 동안 새 호출도 업스트림을 다시 부르지 않음
+    with pytest.raises(RefreshFailed):
+        shared_cache.cached_entry('news', 60, loader)
+    assert len(calls) == 1
+
+
+def test_waiter_takes_over_when_holder_exits_without_writing(cache):
+    assert cache.acquire_lease('market', 'other-process')
+    threading.Timer(0.2, cache.release_lease, args=('market', 'other-process')).start()
+
+    calls = []
+    entry = shared_cache.cached_entry('market', 60, lambda: calls.append(1) or ['KRW-BTC'])
+    assert entry.value == ['KRW-BTC']
+    assert len(calls) == 1
+
+
+def test_prune_removes_entries_past_stale_window(cache):
+    cache.set('old', 1, ttl=0)
+    cache.set('fresh', 2, ttl=3600)
+    cache.prune(stale_seconds=-1)
+    assert cache.get('old') is None
+    assert cache.get('fresh').value == 2
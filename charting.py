@@ -0,0 +1,149 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+########################### 차트 렌더링 (LTTB 다운샘플링 + WebGL) ##############################
+# 긴 기간의 캔들 데이터를 그대로 보내면 그림 JSON 이 수 MB 가 되므로,
+# 시리즈마다 화면 픽셀 수만큼만 점을 남기고(LTTB) WebGL(Scattergl)로 그립니다.
+# 거래량 막대는 점을 골라내면 거래량이 사라지므로 구간별로 합산합니다.
+# 가격 / MACD / CCI / RSI / 거래량을 시간축을 공유하는 하나의 서브플롯 그림으로 합치고,
+# 만든 그림은 (코인, 간격, 기간, 지표) 별로 캐시합니다.
+
+# 시리즈당 최대 점 개수 (차트 가로 픽셀 수 정도)
+PIXEL_BUDGET = 1200
+FIGURE_CACHE_SIZE = 64
+
+# 서브플롯 패널 정의: (지표 이름, 패널 제목, 상대 높이)
+INDICATOR_PANELS = [
+    ('MACD', 'MACD', 0.2),
+    ('CCI', 'CCI', 0.2),
+    ('RSI (14)', 'RSI (14)', 0.2),
+]
+
+_figure_cache = OrderedDict()
+_figure_cache_lock = threading.Lock()
+
+
+# Largest-Triangle-Three-Buckets: 모양을 유지하면서 threshold 개의 점만 남기는 인덱스 반환
+def lttb(x, y, threshold):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # 첫 점과 마지막 점은 항상 포함하고, 나머지를 threshold - 2 개 버킷으로 나눔
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    selected = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # 다음 버킷의 평균점
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        # 직전에 선택한 점, 후보 점, 다음 버킷 평균점이 만드는 삼각형 넓이가 가장 큰 점 선택
+        area = np.abs(
+            (x[selected] - avg_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (avg_y - y[selected])
+        )
+        selected = start + int(np.argmax(area))
+        indices[i + 1] = selected
+
+    return indices
+
+
+# 결측값을 제외하고 LTTB 로 줄인 (x, y) 반환
+def downsample(x, y, threshold=PIXEL_BUDGET):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    mask = np.isfinite(y)
+    x, y = x[mask], y[mask]
+    indices = lttb(x, y, threshold)
+    return x[indices], y[indices]
+
+
+# 막대(거래량)용 다운샘플링: 연속된 봉을 최대 threshold 개 구간으로 묶어 합산 (구간 시작 시각 기준)
+def aggregate_bars(x, y, threshold=PIXEL_BUDGET):
+    x = np.asarray(x, dtype=float)
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    if len(x) <= threshold:
+        return x, y
+    starts = np.unique(np.linspace(0, len(x), threshold, endpoint=False).astype(np.int64))
+    return x[starts], np.add.reduceat(y, starts)
+
+
+# 시간 컬럼을 epoch 밀리초(float)로 변환 - 날짜 문자열 대신 숫자 배열로 직렬화되어 용량이 작음
+def to_epoch_ms(times):
+    return np.asarray(times, dtype='datetime64[ms]').astype(np.int64).astype(float)
+
+
+# 가격 / 기술적 지표 / 거래량을 하나의 서브플롯 그림으로 생성
+def build_price_figure(df, options, title, threshold=PIXEL_BUDGET):
+    panels = [(name, panel_title, height) for name, panel_title, height in INDICATOR_PANELS if name in options]
+    row_titles = ['가격 (KRW)'] + [panel_title for _, panel_title, _ in panels] + ['거래량']
+    row_heights = [0.5] + [height for _, _, height in panels] + [0.15]
+    rows = len(row_titles)
+
+    fig = make_subplots(
+        rows=rows, cols=1, shared_xaxes=True, vertical_spacing=0.03,
+        row_heights=row_heights, subplot_titles=row_titles
+    )
+    x = to_epoch_ms(df['시간'])
+
+    def add_line(row, column, name, **line):
+        line_x, line_y = downsample(x, df[column], threshold)
+        fig.add_trace(go.Scattergl(x=line_x, y=line_y, mode='lines', name=name, line=line or None), row=row, col=1)
+
+    # 가격 패널
+    add_line(1, '가격 (KRW)', '가격 (KRW)')
+    if '이동평균 (5일)' in options:
+        add_line(1, '이동평균 (5일)', '이동평균 (5일)', dash='dot')
+    if '이동평균 (10일)' in options:
+        add_line(1, '이동평균 (10일)', '이동평균 (10일)', dash='dash')
+    if '볼린저 밴드' in options:
+        add_line(1, '볼린저 상단', '볼린저 상단', color='green', dash='dot')
+        add_line(1, '볼린저 하단', '볼린저 하단', color='red', dash='dot')
+
+    # 보조 지표 패널
+    for row, (name, _, _) in enumerate(panels, start=2):
+        if name == 'MACD':
+            add_line(row, 'MACD', 'MACD', color='purple')
+            add_line(row, 'Signal Line', 'Signal Line', color='blue', dash='dot')
+        elif name == 'CCI':
+            add_line(row, 'CCI', 'CCI', color='brown')
+        elif name == 'RSI (14)':
+            add_line(row, 'RSI (14)', 'RSI (14)', color='orange')
+
+    # 거래량 패널 (구간별 합계로 막대 개수를 줄임)
+    volume_x, volume_y = aggregate_bars(x, df['거래량'], threshold)
+    fig.add_trace(go.Bar(x=volume_x, y=volume_y, name='거래량', marker_color='blue'), row=rows, col=1)
+
+    for row in range(1, rows + 1):
+        fig.update_xaxes(type='date', row=row, col=1)
+    fig.update_layout(title=title, height=350 + 180 * (rows - 1), hovermode='x unified')
+    return fig
+
+
+# 그림을 캐시에서 꺼내거나 builder 로 만들어 저장 (프로세스 내 LRU)
+# 그림 객체를 그대로 캐시하여 적중 시 JSON 을 다시 해석 / 검증하지 않음
+# (st.plotly_chart 는 그림을 복사해서 직렬화하므로 공유해도 되지만, 반환된 그림을 수정하면 안 됨)
+def get_cached_figure(key, builder):
+    with _figure_cache_lock:
+        fig = _figure_cache.get(key)
+        if fig is not None:
+            _figure_cache.move_to_end(key)
+    if fig is None:
+        fig = builder()
+        with _figure_cache_lock:
+            _figure_cache[key] = fig
+            _figure_cache.move_to_end(key)
+            while len(_figure_cache) > FIGURE_CACHE_SIZE:
+                _figure_cache.popitem(last=False)
+    return fig
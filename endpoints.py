@@ -0,0 +1,38 @@
+import os
+
+########################### 업스트림 API 주소 설정 ##############################
+# 부하 테스트 등에서 로컬 대체 서버를 사용할 수 있도록 API 기본 주소를 환경 변수로 바꿀 수 있습니다.
+#   BITALGO_UPSTREAM_URL=http://127.0.0.1:8800  -> 모든 API 를 한 서버의 /bithumb, /newsapi, /gdelt, /naver 경로로 연결
+#   BITHUMB_API_URL / NEWSAPI_URL / GDELT_API_URL / NAVER_API_URL  -> API 별로 개별 지정
+
+UPSTREAM_URL = os.environ.get('BITALGO_UPSTREAM_URL', '').rstrip('/')
+
+
+def _base_url(env_name, name, default):
+    if os.environ.get(env_name):
+        return os.environ[env_name].rstrip('/')
+    if UPSTREAM_URL:
+        return f"{UPSTREAM_URL}/{name}"
+    return default
+
+
+BITHUMB_API_URL = _base_url('BITHUMB_API_URL', 'bithumb', 'https://api.bithumb.com')
+NEWSAPI_URL = _base_url('NEWSAPI_URL', 'newsapi', 'https://newsapi.org')
+GDELT_API_URL = _base_url('GDELT_API_URL', 'gdelt', 'https://api.gdeltproject.org')
+NAVER_API_URL = _base_url('NAVER_API_URL', 'naver', 'https://openapi.naver.com')
+
+# 업스트림 이름별 기본 주소 (요청 한도와 통계를 업스트림 단위로 묶을 때 사용)
+UPSTREAMS = {
+    'bithumb': BITHUMB_API_URL,
+    'newsapi': NEWSAPI_URL,
+    'gdelt': GDELT_API_URL,
+    'naver': NAVER_API_URL,
+}
+
+
+# URL 이 속한 업스트림 이름 (등록되지 않은 주소는 호스트 이름)
+def upstream_name(url):
+    for name, base_url in UPSTREAMS.items():
+        if url.startswith(base_url + '/') or url == base_url:
+            return name
+    return url.split('://', 1)[-1].split('/', 1)[0]
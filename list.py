@@ -1,37 +1,57 @@
-from flask import Flask, render_template
+from flask import Flask, Response, render_template
 import requests
+from shared_cache import cached
+import scheduler
+from endpoints import BITHUMB_API_URL
+from metrics import span
+import metrics
 
 app = Flask(__name__, template_folder='templates', static_folder='static')
 app.config['TEMPLATES_AUTO_RELOAD'] = True
 
+# 공유 캐시 유지 시간 (초)
+TICKER_TTL = 5
+MARKET_TTL = 3600
+
+def fetch_crypto_info():
+    url = f"{BITHUMB_API_URL}/public/ticker/ALL_KRW"
+    response = scheduler.request(url)
+    response.raise_for_status()
+    with span('parse', 'bithumb'):
+        data = response.json()
+    if data['status'] != '0000':
+        raise requests.exceptions.HTTPError(f"Bithumb API status {data['status']}")
+    return data['data']
+
 def get_all_crypto_info():
-    url = "https://api.bithumb.com/public/ticker/ALL_KRW"
-    response = requests.get(url)
-    
-    if response.status_code == 200:
-        try:
-            data = response.json()
-            if data['status'] == '0000':
-                return data['data']
-        except ValueError:
-            print("Failed to parse crypto info response as JSON")
+    try:
+        return cached('bithumb:ticker:ALL_KRW', TICKER_TTL, fetch_crypto_info)
+    except ValueError:
+        print("Failed to parse crypto info response as JSON")
+    except requests.exceptions.RequestException as e:
+        print("Failed to fetch crypto info:", e)
     return {}
 
-def get_all_market_info():
+def fetch_market_info():
        # 종목 정보 가져오기
-    market_url = "https://api.bithumb.com/v1/market/all?isDetails=false"    # API 엔드포인트 URL
+    market_url = f"{BITHUMB_API_URL}/v1/market/all?isDetails=false"    # API 엔드포인트 URL
     headers = {"accept": "application/json"}    # 헤더 설정 (필요 시 수정)
-    response = requests.get(market_url, headers=headers)    # API 요청 보내기
-    data = response.json()  # 종목 정보 추출
+    response = scheduler.request(market_url, headers=headers)    # API 요청 보내기
+    response.raise_for_status()
+    with span('parse', 'bithumb'):
+        data = response.json()  # 종목 정보 추출
         
     return data
 
-@app.route('/')
-def index():
-    crypto_data = get_all_crypto_info()
-    market_data = get_all_market_info()
-    print("Crypto Data:", crypto_data)
-    print("Market Data:", market_data)
+def get_all_market_info():
+    try:
+        return cached('bithumb:v1:market:all', MARKET_TTL, fetch_market_info)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print("Failed to fetch market info:", e)
+    return []
+
+# 마켓 목록과 ALL_KRW 시세를 합쳐 표에 표시할 데이터 생성
+def build_processed_data(market_data, crypto_data):
     # 마켓 데이터를 순회하며 필요한 정보만 정리
     processed_data = []
 
@@ -49,10 +69,29 @@ def index():
                     'fluctate_24H': crypto_data[clean_market_key].get('fluctate_24H', 'N/A'),
                     'acc_trade_value_24H': crypto_data[clean_market_key].get('acc_trade_value_24H', 'N/A')
                 })
-    if not processed_data:
-        print("No data was processed. Please check API responses.")
-    
-    return render_template('index.html', processed_data=processed_data)
+    return processed_data
+
+@app.route('/')
+def index():
+    with span('page', 'index'):
+        with span('fetch', 'ticker'):
+            crypto_data = get_all_crypto_info()
+        with span('fetch', 'market'):
+            market_data = get_all_market_info()
+        print("Crypto Data:", crypto_data)
+        print("Market Data:", market_data)
+        with span('compute', 'processed_data'):
+            processed_data = build_processed_data(market_data, crypto_data)
+        if not processed_data:
+            print("No data was processed. Please check API responses.")
+
+        with span('render', 'index.html'):
+            return render_template('index.html', processed_data=processed_data)
+
+# Prometheus 수집용 측정값 (span 지연 시간, 업스트림 호출 / 전송량, 캐시 적중률)
+@app.route('/metrics')
+def metrics_endpoint():
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
 
 if __name__ == '__main__':
     app.run(debug=True)
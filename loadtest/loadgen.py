@@ -0,0 +1,240 @@
+import argparse
+import contextlib
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+import unicodedata
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+########################### 부하 테스트 ##############################
+# 업스트림 대체 서버(mock_upstream)를 띄우고 Streamlit 페이지 렌더링과 Flask(list.py) 요청을 동시에 발생시켜
+# 페이지별 p50 / p95 / p99 지연 시간, 처리량, 렌더링 1회당 업스트림 호출 수(증폭률)를 보고합니다.
+#   python -m loadtest.loadgen --users 8 --renders 40 --latency-ms 80 --rate-limit-rate 0.02
+#   python -m loadtest.loadgen --upstream-url http://127.0.0.1:8800 --flask-url http://127.0.0.1:5000/ --skip-streamlit \
+#       --flask-cache-path /tmp/bitalgo/cache.sqlite3
+# --flask-url 로 외부 서버를 지정하면 그 프로세스의 캐시는 이 프로세스에서 비울 수 없으므로,
+# 외부 서버의 BITALGO_CACHE_PATH 를 --flask-cache-path 로 넘겨야 시나리오가 콜드 캐시에서 시작합니다.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, 'TestCryptoList.py')
+
+STREAMLIT_PAGES = ["실시간 가상자산 시세", "시장 분석", "모의 투자", "카드 뉴스", "경제용어사전"]
+GLOSSARY_TERMS = ["비트코인", "인플레이션", "블록체인", "도미넌스"]
+
+
+# AppTest 가 별도 스크립트로 실행하는 함수: 사이드바 메뉴 선택을 고정하고 앱 스크립트 실행
+def _page_script(page, app_path):
+    import runpy
+    import streamlit_option_menu
+    streamlit_option_menu.option_menu = lambda *args, **kwargs: page
+    runpy.run_path(app_path, run_name='__main__')
+
+
+# 최근접 순위(nearest-rank) 백분위: 정렬된 값 중 ceil(q/100 * n) 번째 값
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+# 업스트림 호출 통계 (로컬 대체 서버 객체 또는 원격 /__stats)
+class UpstreamStats:
+    def __init__(self, mock=None, upstream_url=None):
+        self.mock = mock
+        self.upstream_url = upstream_url
+
+    def reset(self):
+        if self.mock is not None:
+            self.mock.reset()
+        else:
+            import requests
+            requests.get(f"{self.upstream_url}/__reset", timeout=5)
+
+    def snapshot(self):
+        if self.mock is not None:
+            return self.mock.stats()
+        import requests
+        return requests.get(f"{self.upstream_url}/__stats", timeout=5).json()
+
+
+# 공유 캐시 / Streamlit 캐시를 비워 시나리오마다 같은 조건(콜드 캐시)에서 시작
+# external_cache_paths: 다른 프로세스(외부 list.py 서버)가 쓰는 SQLite 캐시 파일
+def reset_caches(external_cache_paths=()):
+    import streamlit as st
+    from shared_cache import SQLiteCache, get_cache
+    get_cache().clear()
+    st.cache_data.clear()
+    for path in external_cache_paths:
+        SQLiteCache(path).clear()
+
+
+def render_streamlit_page(page, term):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_function(_page_script, args=(page, APP_PATH), default_timeout=120)
+    at.run()
+    if page == "경제용어사전" and not at.exception:
+        at.text_input[0].input(term).run()
+    return len(at.exception), len(at.error)
+
+
+def run_scenario(name, task, total, users, stats, external_cache_paths=()):
+    reset_caches(external_cache_paths)
+    stats.reset()
+    latencies = []
+    errors = Counter()
+    lock = threading.Lock()
+
+    def worker(i):
+        start = time.perf_counter()
+        try:
+            error_kind = task(i)
+        except Exception as e:
+            error_kind = type(e).__name__
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+            if error_kind:
+                errors[error_kind] += 1
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as executor:
+        list(executor.map(worker, range(total)))
+    wall = time.perf_counter() - wall_start
+
+    upstream = stats.snapshot()
+    calls = sum(upstream['calls'].get(key, 0) for key in upstream['calls'] if key != 'images')
+    return {
+        'scenario': name,
+        'requests': total,
+        'users': users,
+        'errors': dict(errors),
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+        'throughput_rps': total / wall if wall else None,
+        'upstream_calls': upstream['calls'],
+        'upstream_bytes': upstream['bytes'],
+        'upstream_statuses': upstream['statuses'],
+        'calls_per_request': calls / total if total else None,
+    }
+
+
+def streamlit_scenario(page, renders, users, stats):
+    def task(i):
+        exceptions, page_errors = render_streamlit_page(page, GLOSSARY_TERMS[i % len(GLOSSARY_TERMS)])
+        if exceptions:
+            return 'exception'
+        if page_errors:
+            return 'st.error'
+        return None
+    return run_scenario(f"streamlit:{page}", task, renders, users, stats)
+
+
+def flask_scenario(flask_url, total, users, stats, cache_path=None):
+    import requests
+    local = threading.local()
+
+    def task(i):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        response = session.get(flask_url, timeout=60)
+        return None if response.status_code == 200 else f"HTTP {response.status_code}"
+    external_cache_paths = [cache_path] if cache_path else []
+    return run_scenario(f"flask:{flask_url}", task, total, users, stats, external_cache_paths)
+
+
+# list.py 를 현재 프로세스의 스레드 서버로 실행
+def start_flask():
+    from werkzeug.serving import make_server
+    # 요청마다 stderr 로 출력되는 접속 로그가 결과 표를 덮지 않도록 경고 이상만 출력
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    list_app = __import__('list')
+    server = make_server('127.0.0.1', 0, list_app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='flask', daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/"
+
+
+# 한글처럼 두 칸을 차지하는 문자를 고려하여 왼쪽 정렬
+def ljust_display(text, width):
+    display_width = sum(2 if unicodedata.east_asian_width(ch) in ('W', 'F') else 1 for ch in text)
+    return text + ' ' * max(0, width - display_width)
+
+
+def print_report(results):
+    header = f"{'scenario':<34}{'reqs':>6}{'err':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}{'calls/req':>11}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(
+            f"{ljust_display(r['scenario'], 34)}{r['requests']:>6}{sum(r['errors'].values()):>6}"
+            f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+            f"{r['throughput_rps']:>9.2f}{r['calls_per_request']:>11.2f}"
+        )
+        print(f"{'':<4}upstream calls: {r['upstream_calls']}  statuses: {r['upstream_statuses']}")
+
+
+def main():
+    from loadtest.mock_upstream import add_arguments, mock_from_args, start_in_thread
+
+    parser = argparse.ArgumentParser(description="비트알고 부하 테스트")
+    parser.add_argument('--users', type=int, default=4, help="동시 사용자 수")
+    parser.add_argument('--renders', type=int, default=20, help="Streamlit 페이지별 렌더링 횟수")
+    parser.add_argument('--flask-requests', type=int, default=200, help="Flask 요청 횟수")
+    parser.add_argument('--pages', nargs='*', default=STREAMLIT_PAGES, help="렌더링할 Streamlit 페이지")
+    parser.add_argument('--skip-streamlit', action='store_true')
+    parser.add_argument('--skip-flask', action='store_true')
+    parser.add_argument('--upstream-url', help="이미 실행 중인 업스트림 대체 서버 주소 (없으면 직접 실행)")
+    parser.add_argument('--flask-url', help="이미 실행 중인 list.py 주소 (없으면 직접 실행)")
+    parser.add_argument('--flask-cache-path',
+                        help="--flask-url 서버의 BITALGO_CACHE_PATH (지정하지 않으면 외부 서버 캐시는 비우지 않음)")
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일 경로")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    mock = None
+    if args.upstream_url:
+        upstream_url = args.upstream_url.rstrip('/')
+    else:
+        mock = mock_from_args(args)
+        start_in_thread(mock)
+        upstream_url = mock.base_url
+
+    # 앱 모듈을 불러오기 전에 업스트림 주소와 캐시 위치를 지정해야 함
+    os.environ['BITALGO_UPSTREAM_URL'] = upstream_url
+    os.environ.setdefault('BITALGO_CACHE_PATH', os.path.join(tempfile.mkdtemp(prefix='bitalgo-loadtest-'), 'cache.sqlite3'))
+    os.environ.setdefault('BITALGO_THUMB_DIR', os.path.join(tempfile.mkdtemp(prefix='bitalgo-thumbs-'), 'thumbs'))
+    os.chdir(ROOT)
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    stats = UpstreamStats(mock=mock, upstream_url=None if mock else upstream_url)
+    results = []
+
+    if not args.skip_streamlit:
+        for page in args.pages:
+            results.append(streamlit_scenario(page, args.renders, args.users, stats))
+
+    if not args.skip_flask:
+        # list.py 는 요청마다 응답 전체를 출력하므로 측정 중에는 출력을 버림
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            flask_url = args.flask_url or start_flask()
+            cache_path = args.flask_cache_path if args.flask_url else None
+            results.append(flask_scenario(flask_url, args.flask_requests, args.users, stats, cache_path))
+
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, urlsplit
+
+########################### 업스트림 대체 서버 ##############################
+# 기록된 응답(benchmarks/fixtures)을 빗썸 / NewsAPI / GDELT / 네이버 대신 돌려주는 로컬 서버입니다.
+# 지연 시간, 지터, 오류 / 429 응답 비율을 설정할 수 있고, 업스트림별 호출 수를 /__stats 로 확인할 수 있습니다.
+#   python -m loadtest.mock_upstream --port 8800 --latency-ms 80 --jitter-ms 40 --error-rate 0.01 --rate-limit-rate 0.02
+#   BITALGO_UPSTREAM_URL=http://127.0.0.1:8800 streamlit run TestCryptoList.py
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(ROOT, 'benchmarks', 'fixtures')
+
+MINUTE_INTERVALS = {'1m', '3m', '5m', '10m', '30m'}
+
+
+def _read_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _encode(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+# 카드 뉴스 썸네일 요청에 돌려줄 이미지 (원본 기사 이미지 크기 정도)
+def _sample_image():
+    try:
+        from PIL import Image
+    except ImportError:
+        return b''
+    buffer = BytesIO()
+    Image.new('RGB', (1600, 900), (40, 90, 160)).save(buffer, format='JPEG', quality=90)
+    return buffer.getvalue()
+
+
+class MockUpstream:
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, rate_limit_rate=0.0, retry_after=1, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.base_url = ''
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = Counter()
+        self.bytes_sent = Counter()
+        self.statuses = Counter()
+
+        ticker = _read_fixture('bithumb_ticker_all_krw.json')
+        self._ticker_data = ticker['data']
+        self._responses = {
+            'ticker_all': _encode(ticker),
+            'market_all': _encode(_read_fixture('bithumb_market_all.json')),
+            'candle_minute': _encode(_read_fixture('bithumb_candlestick_btc_1m.json')),
+            'candle_daily': _encode(_read_fixture('bithumb_candlestick_btc_24h.json')),
+            'naver': _encode(_read_fixture('naver_encyc.json')),
+        }
+        self._news = {}
+        for name in os.listdir(FIXTURE_DIR):
+            match = re.match(r'newsapi_everything_(\w+)\.json$', name)
+            if match:
+                self._news[match.group(1)] = _read_fixture(name)
+        self._gdelt = _read_fixture('gdelt_artlist.json')
+        self._image = _sample_image()
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+            self.bytes_sent.clear()
+            self.statuses.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'calls': dict(self.calls), 'bytes': dict(self.bytes_sent), 'statuses': {str(k): v for k, v in self.statuses.items()}}
+
+    # 기사 이미지 주소를 이 서버의 /images 경로로 바꿔서 썸네일 프록시도 로컬에서 동작하도록 함
+    def _with_local_images(self, articles, key):
+        result = []
+        for i, article in enumerate(articles):
+            article = dict(article)
+            if 'urlToImage' in article:
+                article['urlToImage'] = f"{self.base_url}/images/{key}-{i}.jpg"
+            if 'socialimage' in article:
+                article['socialimage'] = f"{self.base_url}/images/gdelt-{i}.jpg"
+            result.append(article)
+        return result
+
+    # (업스트림 이름, 상태 코드, 콘텐츠 타입, 본문) 반환
+    def route(self, path, query):
+        parts = path.strip('/').split('/', 1)
+        upstream, rest = parts[0], '/' + (parts[1] if len(parts) > 1 else '')
+
+        if upstream == 'bithumb':
+            if rest == '/public/ticker/ALL_KRW':
+                return upstream, 200, 'application/json', self._responses['ticker_all']
+            match = re.match(r'/public/ticker/(\w+)_KRW$', rest)
+            if match:
+                data = self._ticker_data.get(match.group(1))
+                body = {'status': '0000', 'data': data} if data else {'status': '5500', 'message': 'Invalid Parameter'}
+                return upstream, 200, 'application/json', _encode(body)
+            match = re.match(r'/public/candlestick/(\w+)_KRW/(\w+)$', rest)
+            if match:
+                key = 'candle_minute' if match.group(2) in MINUTE_INTERVALS else 'candle_daily'
+                return upstream, 200, 'application/json', self._responses[key]
+            if rest == '/v1/market/all':
+                return upstream, 200, 'application/json', self._responses['market_all']
+        elif upstream == 'newsapi' and rest == '/v2/everything':
+            keyword = query.get('q', ['cryptocurrency'])[0]
+            page = self._news.get(keyword) or next(iter(self._news.values()))
+            body = dict(page, articles=self._with_local_images(page['articles'], keyword))
+            return upstream, 200, 'application/json', _encode(body)
+        elif upstream == 'gdelt' and rest == '/api/v2/doc/doc':
+            return upstream, 200, 'application/json', _encode({'articles': self._with_local_images(self._gdelt['articles'], 'gdelt')})
+        elif upstream == 'naver' and rest == '/v1/search/encyc.json':
+            return upstream, 200, 'application/json', self._responses['naver']
+        elif upstream == 'images':
+            return upstream, 200, 'image/jpeg', self._image
+        return upstream, 404, 'application/json', _encode({'error': 'not found'})
+
+    def handle(self, handler):
+        url = urlsplit(handler.path)
+        if url.path == '/__stats':
+            return 200, 'application/json', _encode(self.stats()), {}
+        if url.path == '/__reset':
+            self.reset()
+            return 200, 'application/json', b'{}', {}
+
+        upstream, status, content_type, body = self.route(url.path, parse_qs(url.query))
+
+        delay = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        headers = {}
+        roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            status, body = 429, _encode({'error': 'Too Many Requests'})
+            headers['Retry-After'] = str(self.retry_after)
+        elif roll < self.rate_limit_rate + self.error_rate:
+            status, body = 500, _encode({'error': 'Internal Server Error'})
+
+        with self._lock:
+            self.calls[upstream] += 1
+            self.bytes_sent[upstream] += len(body)
+            self.statuses[status] += 1
+        return status, content_type, body, headers
+
+
+def make_server(mock, host='127.0.0.1', port=8800):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            status, content_type, body, headers = mock.handle(self)
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    mock.base_url = f"http://{host}:{server.server_port}"
+    return server
+
+
+# 백그라운드 스레드에서 서버 시작 (port=0 이면 빈 포트 사용)
+def start_in_thread(mock, host='127.0.0.1', port=0):
+    server = make_server(mock, host, port)
+    threading.Thread(target=server.serve_forever, name='mock-upstream', daemon=True).start()
+    return server
+
+
+def add_arguments(parser):
+    parser.add_argument('--latency-ms', type=float, default=50, help="응답 지연 시간 (ms)")
+    parser.add_argument('--jitter-ms', type=float, default=20, help="지연 시간 편차 (ms)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="500 응답 비율 (0~1)")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument('--retry-after', type=int, default=1, help="429 응답의 Retry-After (초)")
+    parser.add_argument('--seed', type=int, default=None)
+
+
+def mock_from_args(args):
+    return MockUpstream(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after, seed=args.seed
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="업스트림 API 대체 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8800)
+    add_arguments(parser)
+    args = parser.parse_args()
+    server = make_server(mock_from_args(args), args.host, args.port)
+    print(f"mock upstream listening on http://{args.host}:{server.server_port}")
+    server.serve_forever()
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+########################### 시세 데이터 처리 ##############################
+
+# 캔들스틱 응답([[시간, 시가, 종가, 고가, 저가, 거래량], ...])을 (시간, 가격, 거래량) 데이터프레임으로 변환
+def candles_to_frame(historical_data):
+    historical_prices = [float(entry[2]) for entry in historical_data]
+    historical_dates = pd.to_datetime([entry[0] for entry in historical_data], unit='ms')
+    historical_volumes = [float(entry[5]) for entry in historical_data]
+    return pd.DataFrame({'시간': historical_dates, '가격 (KRW)': historical_prices, '거래량': historical_volumes})
+
+# ALL_KRW 시세 데이터를 시세 표 데이터프레임으로 변환
+def build_price_table(crypto_info, korean_names):
+    prices_data = {
+        '코인': [],
+        '코인 이름': [],
+        '현재가 (KRW)': [],
+        '전일 대비 (%)': []
+    }
+
+    for key, value in crypto_info.items():
+        if key == 'date':
+            continue
+        prices_data['코인'].append(key)
+        prices_data['코인 이름'].append(korean_names.get(key, key))
+        prices_data['현재가 (KRW)'].append(value['closing_price'])
+        prices_data['전일 대비 (%)'].append(value['fluctate_rate_24H'])
+
+    return pd.DataFrame(prices_data)
+
+# 기술적 지표 계산 함수 (이동평균, RSI, MACD, 볼린저 밴드, CCI)
+def add_technical_indicators(historical_df):
+    # 이동평균(Moving Average) 계산 및 추가
+    historical_df['이동평균 (5일)'] = historical_df['가격 (KRW)'].rolling(window=5).mean()
+    historical_df['이동평균 (10일)'] = historical_df['가격 (KRW)'].rolling(window=10).mean()
+
+    # RSI (Relative Strength Index) 계산
+    delta = historical_df['가격 (KRW)'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rs = gain / loss
+    historical_df['RSI (14)'] = 100 - (100 / (1 + rs))
+
+    # MACD (Moving Average Convergence Divergence) 계산
+    short_ema = historical_df['가격 (KRW)'].ewm(span=12, adjust=False).mean()
+    long_ema = historical_df['가격 (KRW)'].ewm(span=26, adjust=False).mean()
+    historical_df['MACD'] = short_ema - long_ema
+    historical_df['Signal Line'] = historical_df['MACD'].ewm(span=9, adjust=False).mean()
+
+    # 볼린저 밴드 (Bollinger Bands) 계산
+    historical_df['볼린저 중간선'] = historical_df['가격 (KRW)'].rolling(window=20).mean()
+    historical_df['볼린저 상단'] = historical_df['볼린저 중간선'] + (historical_df['가격 (KRW)'].rolling(window=20).std() * 2)
+    historical_df['볼린저 하단'] = historical_df['볼린저 중간선'] - (historical_df['가격 (KRW)'].rolling(window=20).std() * 2)
+
+    # CCI (Commodity Channel Index) 계산
+    tp = (historical_df['가격 (KRW)'] + historical_df['가격 (KRW)'] + historical_df['가격 (KRW)']) / 3
+    ma = tp.rolling(window=20).mean()
+    md = tp.rolling(window=20).apply(lambda x: np.fabs(x - x.mean()).mean(), raw=True)
+    historical_df['CCI'] = (tp - ma) / (0.015 * md)
+    return historical_df
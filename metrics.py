@@ -0,0 +1,237 @@
+import bisect
+import os
+import random
+import threading
+import time
+from collections import Counter
+
+########################### 성능 측정 ##############################
+# 페이지 함수의 fetch / parse / compute / render 단계를 span 으로 감싸 지연 시간 히스토그램을 기록하고,
+# 업스트림 호출 수, 전송 바이트, 캐시 적중률을 집계합니다.
+# - Flask: /metrics (Prometheus 텍스트 형식)
+# - Streamlit: 사이드바 '성능 진단' 패널
+# span 은 중첩될 수 있으므로 전체 시간(bitalgo_span_seconds)과 함께 하위 span 시간을 뺀
+# 자체 시간(bitalgo_span_self_seconds)을 기록합니다. 진단 패널은 단계별 자체 시간을 보여줍니다.
+# (하위 span 은 같은 스레드에서 실행된 것만 빼고, 스레드 풀에서 실행된 span 은 따로 집계됩니다.)
+# span 은 BITALGO_TRACE_SAMPLE_RATE (0~1, 기본 1) 비율로 최상위 span 단위로 기록하며,
+# 0 이면 아무 작업도 하지 않는 객체를 돌려줍니다. 카운터는 샘플링과 관계없이 항상 집계합니다.
+
+SAMPLE_RATE = float(os.environ.get('BITALGO_TRACE_SAMPLE_RATE', '1.0'))
+
+# 히스토그램 구간 상한 (초)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = Counter()
+# 스레드별 현재 실행 중인 span (하위 span 시간을 부모 자체 시간에서 빼기 위해 사용)
+_local = threading.local()
+
+
+class Histogram:
+    def __init__(self):
+        self.bucket_counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.bucket_counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    # 백분위 값 (초) - Prometheus histogram_quantile 과 같이 구간 안에서 선형 보간
+    # 마지막 구간(+Inf)에 속하면 가장 큰 유한 상한을 반환
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        lower = 0.0
+        for upper, bucket_count in zip(BUCKETS, self.bucket_counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+            lower = upper
+        return BUCKETS[-1]
+
+
+# 히스토그램에 값 기록 (labels 는 (이름, 값) 튜플)
+def observe(metric, labels, value):
+    key = (metric, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(value)
+
+
+# 카운터 증가
+def increment(metric, labels=(), amount=1):
+    with _lock:
+        _counters[(metric, labels)] += amount
+
+
+class _Span:
+    __slots__ = ('kind', 'name', 'start', 'child_seconds', 'parent')
+
+    def __init__(self, kind, name):
+        self.kind = kind
+        self.name = name
+
+    def __enter__(self):
+        self.child_seconds = 0.0
+        self.parent = getattr(_local, 'current', None)
+        _local.current = self
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        _local.current = self.parent
+        if self.parent is not None:
+            self.parent.child_seconds += elapsed
+        # Streamlit 의 재실행 / 중단(BaseException 계열)으로 끊긴 단계는 기록하지 않음
+        if exc_type is not None and not issubclass(exc_type, Exception):
+            return False
+        labels = (('kind', self.kind), ('name', self.name))
+        observe('bitalgo_span_seconds', labels, elapsed)
+        observe('bitalgo_span_self_seconds', labels, max(0.0, elapsed - self.child_seconds))
+        if exc_type is not None:
+            increment('bitalgo_span_errors_total', labels)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+# 단계별 실행 시간을 기록하는 컨텍스트 매니저 (kind: page / fetch / parse / compute / render)
+# 기록 중인 span 안의 하위 span 은 샘플링하지 않고 항상 기록 (부모의 자체 시간이 정확하도록)
+def span(kind, name):
+    if SAMPLE_RATE <= 0:
+        return _NOOP_SPAN
+    if SAMPLE_RATE < 1 and getattr(_local, 'current', None) is None and random.random() >= SAMPLE_RATE:
+        return _NOOP_SPAN
+    return _Span(kind, name)
+
+
+# 업스트림 호출 기록 (호출 수, 상태 코드, 전송 바이트, 지연 시간)
+def record_upstream(upstream, status, size, seconds):
+    with _lock:
+        _counters[('bitalgo_upstream_requests_total', (('upstream', upstream), ('status', str(status))))] += 1
+        _counters[('bitalgo_upstream_bytes_total', (('upstream', upstream),))] += size
+    if SAMPLE_RATE > 0:
+        observe('bitalgo_upstream_request_seconds', (('upstream', upstream),), seconds)
+
+
+# 캐시 조회 결과 기록 (hit / miss / stale / wait / error)
+def record_cache(result):
+    increment('bitalgo_cache_lookups_total', (('result', result),))
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = ('{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for k, v in pairs)
+    return '{' + ','.join(escaped) + '}'
+
+
+# Prometheus 텍스트 형식으로 출력
+def render_prometheus():
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted((key, list(h.bucket_counts), h.count, h.sum) for key, h in _histograms.items())
+
+    lines = []
+    typed = set()
+    for (metric, labels), value in counters:
+        if metric not in typed:
+            lines.append(f"# TYPE {metric} counter")
+            typed.add(metric)
+        lines.append(f"{metric}{_format_labels(labels)} {value}")
+
+    for (metric, labels), bucket_counts, count, total in histograms:
+        if metric not in typed:
+            lines.append(f"# TYPE {metric} histogram")
+            typed.add(metric)
+        cumulative = 0
+        for upper, bucket_count in zip(BUCKETS, bucket_counts):
+            cumulative += bucket_count
+            lines.append(f"{metric}_bucket{_format_labels(labels, [('le', repr(upper))])} {cumulative}")
+        lines.append(f"{metric}_bucket{_format_labels(labels, [('le', '+Inf')])} {count}")
+        lines.append(f"{metric}_sum{_format_labels(labels)} {total}")
+        lines.append(f"{metric}_count{_format_labels(labels)} {count}")
+
+    # 캐시 적중률 (stale 값 제공도 업스트림 호출이 없으므로 적중으로 계산)
+    lookups = {dict(labels)['result']: value for (metric, labels), value in counters if metric == 'bitalgo_cache_lookups_total'}
+    total_lookups = sum(lookups.values())
+    if total_lookups:
+        hits = lookups.get('hit', 0) + lookups.get('stale', 0) + lookups.get('wait', 0)
+        lines.append("# TYPE bitalgo_cache_hit_ratio gauge")
+        lines.append(f"bitalgo_cache_hit_ratio {hits / total_lookups}")
+    return '\n'.join(lines) + '\n'
+
+
+def _summary(histogram):
+    return histogram.count, histogram.sum / histogram.count * 1000, histogram.quantile(0.95) * 1000
+
+
+# 진단 패널용 요약 (span 별 횟수 / 자체 시간 평균·p95 / 전체 시간 평균, 업스트림 호출·지연 시간, 캐시 적중률)
+def snapshot():
+    spans = {}
+    upstream_latency = {}
+    with _lock:
+        for (metric, labels), histogram in _histograms.items():
+            if not histogram.count:
+                continue
+            label_map = dict(labels)
+            count, avg_ms, p95_ms = _summary(histogram)
+            if metric == 'bitalgo_upstream_request_seconds':
+                upstream_latency[label_map['upstream']] = {'count': count, 'avg_ms': avg_ms, 'p95_ms': p95_ms}
+                continue
+            row = spans.setdefault((label_map['kind'], label_map['name']), {'kind': label_map['kind'], 'name': label_map['name']})
+            if metric == 'bitalgo_span_self_seconds':
+                row.update(count=count, self_avg_ms=avg_ms, self_p95_ms=p95_ms)
+            elif metric == 'bitalgo_span_seconds':
+                row['total_avg_ms'] = avg_ms
+        counters = dict(_counters)
+
+    upstream_calls = Counter()
+    upstream_bytes = Counter()
+    cache = Counter()
+    for (metric, labels), value in counters.items():
+        label_map = dict(labels)
+        if metric == 'bitalgo_upstream_requests_total':
+            upstream_calls[label_map['upstream']] += value
+        elif metric == 'bitalgo_upstream_bytes_total':
+            upstream_bytes[label_map['upstream']] += value
+        elif metric == 'bitalgo_cache_lookups_total':
+            cache[label_map['result']] += value
+
+    total_lookups = sum(cache.values())
+    hits = cache['hit'] + cache['stale'] + cache['wait']
+    return {
+        'spans': [spans[key] for key in sorted(spans)],
+        'upstream_latency': upstream_latency,
+        'upstream_calls': dict(upstream_calls),
+        'upstream_bytes': dict(upstream_bytes),
+        'cache_lookups': dict(cache),
+        'cache_hit_ratio': hits / total_lookups if total_lookups else None,
+    }
+
+
+# 측정값 초기화
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
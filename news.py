@@ -0,0 +1,35 @@
+import re
+from collections import Counter
+
+########################### 뉴스 데이터 처리 ##############################
+
+# 핫 키워드 집계에서 제외할 단어
+STOP_WORDS = set([
+    'the', 'and', 'of', 'in', 'to', 'a', 'is', 'for', 'on', 'with', 'that', 'by', 'from',
+    'at', 'as', 'an', 'it', 'this', 'be', 'are', 'was', 'were', 'or', 'but', 'not', 'have',
+    'has', 'had', 'can', 'could', 'should', 'would', 'about', 'more', 'some', 'other',
+    'into', 'also', 'which', 'up', 'out', 'if', 'will', 'one', 'all', 'no', 'do', 'does',
+    'did', 'just', 'than', 'so', 'only', 'over', 'its', 'new', 'like', 'how', 'when', 'them',
+    'these', 'those', 'then', 'he', 'she', 'they', 'his', 'her', 'their', 'our', 'us',
+    's', 'de', 'el', 'la', 'в', 'un', 'en', '2024'
+])
+
+# 여러 기사 목록을 순서대로 합치면서 제목이 같은 기사 제거
+def dedupe_articles(*article_lists):
+    unique_articles = []
+    seen_titles = set()
+    for articles in article_lists:
+        for article in articles:
+            title = article.get('title')
+            if title not in seen_titles:
+                seen_titles.add(title)
+                unique_articles.append(article)
+    return unique_articles
+
+# 가장 많이 등장하는 단어를 추출하는 함수
+def get_top_keywords(articles, top_n=10):
+    all_text = " ".join([article.get('title', '') for article in articles])
+    words = re.findall(r'\w+', all_text.lower())
+    filtered_words = [word for word in words if word not in STOP_WORDS]
+    word_counts = Counter(filtered_words)
+    return word_counts.most_common(top_n)
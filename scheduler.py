@@ -0,0 +1,252 @@
+import email.utils
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import requests
+from requests.adapters import HTTPAdapter
+
+from endpoints import upstream_name
+import metrics
+
+########################### 업스트림 요청 스케줄러 ##############################
+# 빗썸 / NewsAPI / GDELT / 네이버 요청을 한 곳에서 처리합니다.
+# - 업스트림마다 토큰 버킷으로 초당 요청 수를 제한 (endpoints.UPSTREAMS 기준, 그 외 주소는 호스트별)
+# - 업스트림별 우선순위 큐: 화면 로딩(INTERACTIVE) 요청이 백그라운드 갱신이나 전체 코인 조회보다 먼저 처리됨
+# - 대기 중이거나 진행 중인 동일한 요청은 하나로 합침
+# - 429 / 503 응답의 Retry-After 동안 해당 호스트 요청을 멈춘 뒤 재시도
+# - 기사 이미지처럼 호스트가 계속 바뀌는 요청은 queue 이름을 지정하여 하나의 큐로 묶음 (호스트마다 스레드가 생기지 않도록)
+
+# 우선순위 (숫자가 작을수록 먼저 처리)
+INTERACTIVE = 0
+BACKGROUND = 10
+SWEEP = 20
+
+# 업스트림별 (초당 요청 수, 최대 버스트)
+HOST_LIMITS = {
+    'bithumb': (20, 20),
+    'newsapi': (0.5, 4),
+    'gdelt': (0.2, 1),
+    'naver': (10, 10),
+    'images': (10, 10),
+}
+DEFAULT_LIMIT = (5, 5)
+
+MAX_WORKERS = 16
+MAX_RETRIES = 3
+# 요청이 큐에서 기다릴 수 있는 최대 시간 (초)
+WAIT_TIMEOUT = 30
+# max_bytes 를 지정한 요청의 본문을 읽는 단위 (바이트)
+CHUNK_SIZE = 64 * 1024
+
+
+# 응답 본문이 max_bytes 를 넘는 경우
+class ResponseTooLarge(requests.exceptions.RequestException):
+    pass
+
+
+# 토큰 버킷 (호스트 큐의 잠금 안에서만 사용)
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    # 토큰 하나를 쓸 수 있을 때까지 남은 시간 (초)
+    def wait_time(self, now):
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def consume(self):
+        self.tokens -= 1
+
+
+class _Job:
+    def __init__(self, key, url, params, headers, timeout, priority, max_bytes):
+        self.key = key
+        self.url = url
+        self.params = params
+        self.headers = headers
+        self.timeout = timeout
+        self.priority = priority
+        self.max_bytes = max_bytes
+        self.attempts = 0
+        self.started = False
+        self.future = Future()
+
+
+class _HostQueue:
+    def __init__(self, host, rate, capacity):
+        self.host = host
+        self.bucket = TokenBucket(rate, capacity)
+        self.heap = []
+        self.blocked_until = 0.0
+        self.cond = threading.Condition()
+
+
+# 본문을 나누어 읽으면서 max_bytes 를 넘으면 즉시 중단 (다 받은 뒤 크기를 확인하지 않도록)
+def read_limited(response, max_bytes):
+    length = response.headers.get('Content-Length')
+    if length and length.isdigit() and int(length) > max_bytes:
+        response.close()
+        raise ResponseTooLarge(f"응답 크기 {length} 바이트가 한도 {max_bytes} 바이트를 넘습니다: {response.url}")
+    chunks = []
+    size = 0
+    for chunk in response.iter_content(CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_bytes:
+            response.close()
+            raise ResponseTooLarge(f"응답 크기가 한도 {max_bytes} 바이트를 넘습니다: {response.url}")
+        chunks.append(chunk)
+    response._content = b''.join(chunks)
+    return response
+
+
+# Retry-After 헤더 해석 (초 단위 또는 HTTP 날짜)
+def parse_retry_after(value, default=1.0):
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class RequestScheduler:
+    def __init__(self, limits=HOST_LIMITS, max_workers=MAX_WORKERS):
+        self.limits = limits
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self._pending = {}
+        self._seq = itertools.count()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='upstream')
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(limits) + 1, pool_maxsize=max_workers)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+    # 호스트 큐를 가져오거나 새로 만들고 디스패처 스레드 시작
+    def _host_queue(self, host):
+        with self._lock:
+            queue = self._hosts.get(host)
+            if queue is None:
+                rate, capacity = self.limits.get(host, DEFAULT_LIMIT)
+                queue = _HostQueue(host, rate, capacity)
+                self._hosts[host] = queue
+                threading.Thread(target=self._dispatch, args=(queue,), name=f'dispatch-{host}', daemon=True).start()
+            return queue
+
+    def _push(self, queue, job, priority):
+        with queue.cond:
+            heapq.heappush(queue.heap, (priority, next(self._seq), job))
+            queue.cond.notify()
+
+    # GET 요청을 큐에 넣고 requests.Response 를 돌려줄 Future 반환
+    # queue: 요청 한도를 적용할 큐 이름 (기본은 URL 의 업스트림 이름)
+    # max_bytes: 본문 최대 크기 (넘으면 ResponseTooLarge)
+    def submit(self, url, params=None, headers=None, priority=INTERACTIVE, timeout=10, queue=None, max_bytes=None):
+        key = (url, tuple(sorted((params or {}).items())), tuple(sorted((headers or {}).items())), max_bytes)
+        host_queue = self._host_queue(queue or upstream_name(url))
+        with self._lock:
+            job = self._pending.get(key)
+            if job is None:
+                job = _Job(key, url, params, headers, timeout, priority, max_bytes)
+                self._pending[key] = job
+            elif priority < job.priority and not job.started:
+                # 같은 요청이 더 급한 우선순위로 다시 들어오면 우선순위를 올림 (이전 항목은 디스패처가 건너뜀)
+                job.priority = priority
+            else:
+                return job.future
+        self._push(host_queue, job, priority)
+        return job.future
+
+    # 요청을 보내고 응답을 기다림
+    def request(self, url, params=None, headers=None, priority=INTERACTIVE, timeout=10, wait_timeout=WAIT_TIMEOUT, queue=None, max_bytes=None):
+        future = self.submit(url, params=params, headers=headers, priority=priority, timeout=timeout, queue=queue, max_bytes=max_bytes)
+        try:
+            return future.result(timeout=wait_timeout)
+        except FutureTimeoutError:
+            raise requests.exceptions.Timeout(f"요청 대기 시간 초과: {url}")
+
+    def _dispatch(self, queue):
+        while True:
+            with queue.cond:
+                while not queue.heap:
+                    queue.cond.wait()
+                now = time.monotonic()
+                delay = max(queue.blocked_until - now, queue.bucket.wait_time(now))
+                if delay > 0:
+                    # 기다리는 동안 더 급한 요청이 들어올 수 있으므로 다시 확인
+                    queue.cond.wait(delay)
+                    continue
+                priority, _, job = heapq.heappop(queue.heap)
+                if job.started or priority != job.priority:
+                    continue
+                job.started = True
+                queue.bucket.consume()
+            self._executor.submit(self._run, queue, job)
+
+    def _run(self, queue, job):
+        start = time.perf_counter()
+        try:
+            response = self._session.get(job.url, params=job.params, headers=job.headers, timeout=job.timeout, stream=job.max_bytes is not None)
+            if job.max_bytes is not None:
+                read_limited(response, job.max_bytes)
+        except Exception as e:
+            metrics.record_upstream(queue.host, 'error', 0, time.perf_counter() - start)
+            self._finish(job, error=e)
+            return
+        metrics.record_upstream(queue.host, response.status_code, len(response.content), time.perf_counter() - start)
+
+        if response.status_code in (429, 503) and job.attempts < MAX_RETRIES:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'), default=2.0 ** job.attempts)
+            with queue.cond:
+                queue.blocked_until = max(queue.blocked_until, time.monotonic() + retry_after)
+                job.attempts += 1
+                job.started = False
+            self._push(queue, job, job.priority)
+            return
+
+        self._finish(job, response=response)
+
+    def _finish(self, job, response=None, error=None):
+        with self._lock:
+            self._pending.pop(job.key, None)
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(response)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+# 프로세스 전체에서 공유하는 스케줄러
+def get_scheduler():
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = RequestScheduler()
+    return _scheduler
+
+
+def submit(url, params=None, headers=None, priority=INTERACTIVE, timeout=10, queue=None, max_bytes=None):
+    return get_scheduler().submit(url, params=params, headers=headers, priority=priority, timeout=timeout, queue=queue, max_bytes=max_bytes)
+
+
+def request(url, params=None, headers=None, priority=INTERACTIVE, timeout=10, wait_timeout=WAIT_TIMEOUT, queue=None, max_bytes=None):
+    return get_scheduler().request(
+        url, params=params, headers=headers, priority=priority, timeout=timeout, wait_timeout=wait_timeout, queue=queue, max_bytes=max_bytes
+    )
@@ -0,0 +1,295 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+import requests
+
+import metrics
+
+########################### 프로세스 간 공유 캐시 ##############################
+# 같은 호스트에서 실행되는 여러 Streamlit / Flask 프로세스가 하나의 업스트림 응답을 공유하도록 합니다.
+# - 항목마다 버전을 기록하여 값이 바뀌었는지 확인할 수 있습니다.
+# - 만료된 키는 리스(lease)를 얻은 한 스레드만 새로 가져오고, 나머지는 이전 값을 사용하거나 갱신을 기다립니다.
+# - 갱신에 실패하면 리스를 FAILURE_SECONDS 동안 실패 표시로 남겨, 기다리던 호출은 바로 오류를 받고
+#   새 호출은 이전 값을 사용합니다 (실패한 업스트림을 모든 호출이 다시 부르지 않도록).
+# - 만료 후 STALE_SECONDS 가 지난 항목은 PRUNE_INTERVAL 마다 삭제합니다 (검색어별 키가 계속 쌓이지 않도록).
+
+# 캐시 백엔드 설정 (sqlite: 프로세스 간 공유, memory: 현재 프로세스 전용)
+CACHE_BACKEND = os.environ.get('BITALGO_CACHE_BACKEND', 'sqlite')
+CACHE_PATH = os.environ.get('BITALGO_CACHE_PATH', './.cache/bitalgo_cache.sqlite3')
+
+# 리스 유지 시간과 다른 프로세스의 갱신을 기다리는 시간 (초)
+LEASE_SECONDS = 15
+WAIT_TIMEOUT = 10
+POLL_INTERVAL = 0.05
+# 갱신 실패를 알리는 리스 소유자와 유지 시간 (초)
+FAILED_OWNER = 'failed'
+FAILURE_SECONDS = 3
+
+# 만료된 항목을 이전 값으로 제공할 수 있는 시간과 오래된 항목을 정리하는 주기 (초)
+STALE_SECONDS = 600
+PRUNE_INTERVAL = 300
+
+# 현재 프로세스를 구분하는 ID (리스 소유자는 여기에 스레드 ID 를 붙여 스레드마다 구분)
+OWNER_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+# 현재 스레드의 리스 소유자 ID (같은 프로세스의 다른 세션 스레드도 리스를 따로 얻어야 함)
+def lease_owner():
+    return f"{OWNER_ID}-{threading.get_ident()}"
+
+CacheEntry = namedtuple('CacheEntry', ['value', 'version', 'stored_at'])
+
+
+# 다른 스레드 / 프로세스의 갱신이 실패했거나 끝나지 않아 값을 얻지 못한 경우
+# (호출하는 쪽이 업스트림 요청 오류와 같은 방식으로 처리하도록 RequestException 을 상속)
+class RefreshFailed(requests.exceptions.RequestException):
+    pass
+
+
+# 현재 프로세스 메모리에만 저장하는 캐시 (단일 프로세스 실행 또는 테스트용)
+class MemoryCache:
+    def __init__(self):
+        self._entries = {}
+        self._expires = {}
+        self._leases = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key, value, ttl=0):
+        now = time.time()
+        with self._lock:
+            previous = self._entries.get(key)
+            version = previous.version + 1 if previous else 1
+            self._entries[key] = CacheEntry(value, version, now)
+            self._expires[key] = now + ttl
+            return version
+
+    def acquire_lease(self, key, owner, seconds=LEASE_SECONDS):
+        now = time.time()
+        with self._lock:
+            holder = self._leases.get(key)
+            if holder and holder[0] != owner and holder[1] > now:
+                return False
+            self._leases[key] = (owner, now + seconds)
+            return True
+
+    def release_lease(self, key, owner):
+        with self._lock:
+            if self._leases.get(key, (None,))[0] == owner:
+                del self._leases[key]
+
+    # 갱신 실패 표시: owner 의 리스를 seconds 동안 FAILED_OWNER 로 바꿈
+    def fail_lease(self, key, owner, seconds=FAILURE_SECONDS):
+        with self._lock:
+            if self._leases.get(key, (None,))[0] == owner:
+                self._leases[key] = (FAILED_OWNER, time.time() + seconds)
+
+    # 만료되지 않은 리스의 소유자 (없으면 None)
+    def lease_holder(self, key):
+        with self._lock:
+            holder = self._leases.get(key)
+            if holder and holder[1] >= time.time():
+                return holder[0]
+            return None
+
+    # 만료 후 stale_seconds 가 지난 항목과 만료된 리스 삭제
+    def prune(self, stale_seconds=STALE_SECONDS):
+        now = time.time()
+        with self._lock:
+            for key in [key for key, expires_at in self._expires.items() if expires_at + stale_seconds < now]:
+                del self._entries[key]
+                del self._expires[key]
+            for key in [key for key, (_, expires_at) in self._leases.items() if expires_at < now]:
+                del self._leases[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._expires.clear()
+            self._leases.clear()
+
+
+# SQLite(WAL 모드) 파일에 저장하여 같은 호스트의 모든 프로세스가 공유하는 캐시
+class SQLiteCache:
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, version INTEGER NOT NULL, stored_at REAL NOT NULL, expires_at REAL NOT NULL DEFAULT 0)")
+        conn.execute("CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)")
+        # 만료 시각 컬럼이 없던 이전 캐시 파일은 컬럼을 추가 (기존 항목은 다음 정리 때 삭제)
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(entries)")]
+        if 'expires_at' not in columns:
+            conn.execute("ALTER TABLE entries ADD COLUMN expires_at REAL NOT NULL DEFAULT 0")
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at)")
+
+    # 스레드마다 별도의 연결을 사용 (Streamlit / Flask 모두 요청을 스레드로 처리)
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._connect().execute("SELECT value, version, stored_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return CacheEntry(json.loads(row[0]), row[1], row[2])
+
+    def set(self, key, value, ttl=0):
+        conn = self._connect()
+        now = time.time()
+        conn.execute(
+            "INSERT INTO entries (key, value, version, stored_at, expires_at) VALUES (?, ?, 1, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, version = entries.version + 1, "
+            "stored_at = excluded.stored_at, expires_at = excluded.expires_at",
+            (key, json.dumps(value, ensure_ascii=False), now, now + ttl)
+        )
+        return conn.execute("SELECT version FROM entries WHERE key = ?", (key,)).fetchone()[0]
+
+    # 리스가 없거나 만료된 경우에만 한 문장으로 원자적으로 획득
+    def acquire_lease(self, key, owner, seconds=LEASE_SECONDS):
+        now = time.time()
+        cursor = self._connect().execute(
+            "INSERT INTO leases (key, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+            "WHERE leases.expires_at < ? OR leases.owner = excluded.owner",
+            (key, owner, now + seconds, now)
+        )
+        return cursor.rowcount == 1
+
+    def release_lease(self, key, owner):
+        self._connect().execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, owner))
+
+    # 갱신 실패 표시: owner 의 리스를 seconds 동안 FAILED_OWNER 로 바꿈
+    def fail_lease(self, key, owner, seconds=FAILURE_SECONDS):
+        self._connect().execute(
+            "UPDATE leases SET owner = ?, expires_at = ? WHERE key = ? AND owner = ?",
+            (FAILED_OWNER, time.time() + seconds, key, owner)
+        )
+
+    # 만료되지 않은 리스의 소유자 (없으면 None)
+    def lease_holder(self, key):
+        row = self._connect().execute("SELECT owner FROM leases WHERE key = ? AND expires_at >= ?", (key, time.time())).fetchone()
+        return row[0] if row else None
+
+    # 만료 후 stale_seconds 가 지난 항목과 만료된 리스 삭제
+    def prune(self, stale_seconds=STALE_SECONDS):
+        now = time.time()
+        conn = self._connect()
+        conn.execute("DELETE FROM entries WHERE expires_at + ? < ?", (stale_seconds, now))
+        conn.execute("DELETE FROM leases WHERE expires_at < ?", (now,))
+
+    def clear(self):
+        conn = self._connect()
+        conn.execute("DELETE FROM entries")
+        conn.execute("DELETE FROM leases")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+_last_prune = 0.0
+
+
+# 설정된 백엔드의 캐시 객체 반환 (프로세스당 하나)
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = MemoryCache() if CACHE_BACKEND == 'memory' else SQLiteCache(CACHE_PATH)
+    return _cache
+
+
+# PRUNE_INTERVAL 마다 한 번씩 오래된 항목 정리 (프로세스마다 따로 실행해도 결과는 같음)
+def _prune_if_due(cache):
+    global _last_prune
+    now = time.time()
+    if now - _last_prune < PRUNE_INTERVAL:
+        return
+    with _cache_lock:
+        if now - _last_prune < PRUNE_INTERVAL:
+            return
+        _last_prune = now
+    cache.prune()
+
+
+# 캐시 항목(값, 버전, 저장 시각)을 반환하고, 만료되었으면 loader 로 새로 가져옴
+# loader 가 예외를 발생시키면 캐시에 저장하지 않고 그대로 전달합니다.
+def cached_entry(key, ttl, loader):
+    cache = get_cache()
+    entry = cache.get(key)
+    if entry is not None and time.time() - entry.stored_at < ttl:
+        metrics.record_cache('hit')
+        return entry
+
+    owner = lease_owner()
+    if cache.acquire_lease(key, owner):
+        return _refresh(cache, key, ttl, loader, owner)
+
+    # 다른 스레드 / 프로세스가 갱신 중이거나 방금 실패했으면 이전 값을 그대로 사용
+    if entry is not None:
+        metrics.record_cache('stale')
+        return entry
+
+    # 이전 값이 없으면 갱신이 끝날 때까지 대기
+    # 리스가 실패로 표시되면 바로 오류, 리스가 사라지면(갱신한 쪽이 종료됨) 직접 리스를 얻어 갱신
+    deadline = time.time() + WAIT_TIMEOUT
+    while True:
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            metrics.record_cache('wait')
+            return entry
+        holder = cache.lease_holder(key)
+        if holder == FAILED_OWNER:
+            metrics.record_cache('error')
+            raise RefreshFailed(f"캐시 갱신 실패: {key}")
+        if holder is None and cache.acquire_lease(key, owner):
+            return _refresh(cache, key, ttl, loader, owner)
+        if time.time() >= deadline:
+            metrics.record_cache('error')
+            raise RefreshFailed(f"캐시 갱신 대기 시간 초과: {key}")
+
+
+# 리스를 가진 상태에서 loader 로 값을 가져와 저장
+# loader 가 실패하면 리스를 실패 표시로 바꾸어 기다리는 호출이 바로 알 수 있도록 함
+def _refresh(cache, key, ttl, loader, owner):
+    try:
+        # 리스를 얻기 직전에 다른 쪽이 갱신을 마쳤으면 그 값을 사용
+        entry = cache.get(key)
+        if entry is not None and time.time() - entry.stored_at < ttl:
+            metrics.record_cache('hit')
+            cache.release_lease(key, owner)
+            return entry
+        metrics.record_cache('miss')
+        value = loader()
+        version = cache.set(key, value, ttl)
+    except Exception:
+        cache.fail_lease(key, owner)
+        raise
+    except BaseException:
+        cache.release_lease(key, owner)
+        raise
+    cache.release_lease(key, owner)
+    _prune_if_due(cache)
+    return CacheEntry(value, version, time.time())
+
+
+# 캐시된 값만 반환
+def cached(key, ttl, loader):
+    return cached_entry(key, ttl, loader).value
@@ -0,0 +1,205 @@
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from PIL import Image
+
+import scheduler
+
+########################### 카드 뉴스 썸네일 프록시 ##############################
+# 기사 원본 이미지를 한 번만 내려받아 화면에 표시되는 너비로 줄인 뒤 WebP(불가 시 JPEG)로 저장합니다.
+# 저장 폴더는 Streamlit 정적 파일 경로(app/static)와 Flask static 폴더로 제공되며,
+# 전체 용량이 한도를 넘으면 가장 오래 사용하지 않은 파일부터 삭제합니다 (LRU).
+# 페이지는 썸네일을 기다리지 않습니다: 아직 없는 이미지는 원본 URL 로 먼저 그리고 백그라운드에서 만들어 두면,
+# 다음 렌더링부터 썸네일을 사용합니다.
+
+THUMB_DIR = os.environ.get('BITALGO_THUMB_DIR', './static/thumbs')
+# 썸네일을 가리키는 URL 경로 (Streamlit 정적 파일 서빙 기준, Flask 에서는 '/static/thumbs')
+THUMB_URL_PREFIX = os.environ.get('BITALGO_THUMB_URL_PREFIX', 'app/static/thumbs')
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+MAX_SOURCE_BYTES = 15 * 1024 * 1024
+# 원본 이미지의 최대 픽셀 수 - 압축률이 높은 PNG 는 15MB 이하여도 디코딩하면 수백 MB 가 될 수 있음
+MAX_SOURCE_PIXELS = 25_000_000
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+# 실패한 이미지는 이 시간(초) 동안 다시 시도하지 않고 원본 URL 을 사용
+FAILURE_TTL = 3600
+# 기사 이미지 요청을 모두 묶는 스케줄러 큐 이름 (요청 한도는 scheduler.HOST_LIMITS['images'])
+IMAGE_QUEUE = 'images'
+# 백그라운드에서 썸네일을 만드는 작업자 수
+BUILD_WORKERS = 4
+
+_failed = {}
+_failed_lock = threading.Lock()
+_evict_lock = threading.Lock()
+_build_executor = ThreadPoolExecutor(max_workers=BUILD_WORKERS, thread_name_prefix='thumbnail')
+_building = set()
+_building_lock = threading.Lock()
+
+
+def _thumb_name(image_url, width):
+    return hashlib.sha256(f"{width}:{image_url}".encode('utf-8')).hexdigest()[:32]
+
+
+# 이미 만들어 둔 썸네일 파일 찾기
+def _find_cached(name):
+    for ext in ('.webp', '.jpg'):
+        path = os.path.join(THUMB_DIR, name + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+# 실패 기록 (기록할 때 FAILURE_TTL 이 지난 항목은 삭제하여 계속 쌓이지 않도록 함)
+def _record_failure(name):
+    now = time.time()
+    with _failed_lock:
+        for key in [key for key, failed_at in _failed.items() if now - failed_at >= FAILURE_TTL]:
+            del _failed[key]
+        _failed[name] = now
+
+
+# 원본 이미지를 받아 width 에 맞게 줄이고 WebP / JPEG 바이트로 변환
+def _render_thumbnail(data, width):
+    with Image.open(BytesIO(data)) as image:
+        # 헤더의 크기만 읽은 상태에서 확인하여 픽셀 데이터를 디코딩하기 전에 거부 (압축 폭탄 방지)
+        if image.width * image.height > MAX_SOURCE_PIXELS:
+            raise ValueError(f"이미지 크기가 너무 큽니다: {image.width}x{image.height}")
+        image.draft('RGB', (width, width * 4))
+        image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+        if image.width > width:
+            image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+        output = BytesIO()
+        try:
+            image.save(output, format='WEBP', quality=WEBP_QUALITY, method=4)
+            return output.getvalue(), '.webp'
+        except (OSError, KeyError):
+            output = BytesIO()
+            image.convert('RGB').save(output, format='JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+            return output.getvalue(), '.jpg'
+
+
+# 용량 한도를 넘으면 가장 오래 사용하지 않은(수정 시각 기준) 파일부터 삭제
+def _evict(max_bytes=MAX_CACHE_BYTES):
+    with _evict_lock:
+        stats = []
+        try:
+            for entry in os.scandir(THUMB_DIR):
+                # 다른 스레드 / 프로세스가 쓰는 중인 임시 파일은 제외 (그 사이 이름이 바뀌거나 삭제될 수 있음)
+                if entry.name.endswith('.tmp'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                stats.append((stat.st_mtime, stat.st_size, entry.path))
+        except FileNotFoundError:
+            return
+        total = sum(size for _, size, _ in stats)
+        for _, size, path in sorted(stats):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+
+
+# 이미 만들어 둔 썸네일 파일 경로 (없으면 None)
+def cached_thumbnail(image_url, width):
+    path = _find_cached(_thumb_name(image_url, width))
+    if path:
+        # 사용 시각을 갱신하여 LRU 순서 유지
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+    return path
+
+
+def _recently_failed(name):
+    failed_at = _failed.get(name)
+    return failed_at is not None and time.time() - failed_at < FAILURE_TTL
+
+
+# 썸네일 파일 경로 반환 (없으면 만들어서 저장, 실패 시 None)
+def get_thumbnail(image_url, width, priority=scheduler.INTERACTIVE):
+    path = cached_thumbnail(image_url, width)
+    if path:
+        return path
+
+    name = _thumb_name(image_url, width)
+    if _recently_failed(name):
+        return None
+
+    try:
+        response = scheduler.request(
+            image_url, priority=priority, timeout=5, wait_timeout=10, queue=IMAGE_QUEUE, max_bytes=MAX_SOURCE_BYTES
+        )
+        response.raise_for_status()
+        data, ext = _render_thumbnail(response.content, width)
+    except Exception:
+        _record_failure(name)
+        return None
+
+    path = os.path.join(THUMB_DIR, name + ext)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(THUMB_DIR, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        # 저장하지 못하면 원본 URL 사용 (디스크 가득 참, 권한 없음 등)
+        # 임시 파일은 _evict 가 건너뛰므로 여기서 지움
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return None
+    # 캐시 정리 실패는 방금 만든 썸네일 사용에 영향을 주지 않음
+    try:
+        _evict()
+    except OSError:
+        pass
+    return path
+
+
+def _build(image_url, width, name):
+    try:
+        get_thumbnail(image_url, width, priority=scheduler.BACKGROUND)
+    finally:
+        with _building_lock:
+            _building.discard(name)
+
+
+# 썸네일 생성을 백그라운드 작업으로 예약 (같은 이미지는 진행 중인 작업 하나만)
+def request_thumbnail(image_url, width):
+    name = _thumb_name(image_url, width)
+    if _recently_failed(name):
+        return
+    with _building_lock:
+        if name in _building:
+            return
+        _building.add(name)
+    _build_executor.submit(_build, image_url, width, name)
+
+
+# 카드 HTML 에 넣을 이미지 URL (썸네일이 아직 없으면 만들도록 예약하고 원본 URL)
+def thumbnail_url(image_url, width):
+    if not image_url:
+        return image_url
+    path = cached_thumbnail(image_url, width)
+    if path is None:
+        request_thumbnail(image_url, width)
+        return image_url
+    return f"{THUMB_URL_PREFIX}/{os.path.basename(path)}"
+
+
+# 여러 이미지의 URL 을 기다리지 않고 바로 반환
+def thumbnail_urls(image_urls, width):
+    return [thumbnail_url(url, width) for url in image_urls]